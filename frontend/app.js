@@ -354,7 +354,7 @@ function App() {
     }
     setOrderingState({ loading: true, data: null, error: null });
     try {
-      const response = await fetch(url + "/ordering/status");
+      const response = await fetch(url + "/ordering/status?samples=5");
       const data = await response.json();
       if (!response.ok) {
         throw new Error(data && data.message ? data.message : "Failed to fetch ordering status");
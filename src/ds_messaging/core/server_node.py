@@ -4,6 +4,7 @@ logging.basicConfig(level=logging.INFO,
 logger = logging.getLogger(__name__)
 
 import argparse
+import aiohttp
 from aiohttp import web
 import asyncio
 
@@ -36,15 +37,20 @@ ALLOWED_CORS_HEADERS = "Content-Type,Accept"
 @web.middleware
 async def cors_middleware(request, handler):
     if request.method == "OPTIONS":
-        response = web.Response(status=204)
-    else:
-        response = await handler(request)
+        return web.Response(status=204)
+    return await handler(request)
+
+
+async def add_cors_headers(request, response):
+    """
+    Attach CORS headers as the response is prepared, so streamed responses
+    (whose headers are sent before the handler returns) get them too.
+    """
     origin = request.headers.get("Origin")
     response.headers["Access-Control-Allow-Origin"] = origin or "*"
     response.headers["Access-Control-Allow-Methods"] = ALLOWED_CORS_METHODS
     response.headers["Access-Control-Allow-Headers"] = ALLOWED_CORS_HEADERS
     response.headers["Access-Control-Max-Age"] = "86400"
-    return response
 
 
 
@@ -74,6 +80,7 @@ def make_app(node: Node):
         web.get('/time/stats', time_stats_handler),
         web.post('/time/reset', reset_stats_handler),
     ])
+    app.on_response_prepare.append(add_cors_headers)
     app.on_startup.append(on_startup)
     app.on_cleanup.append(on_cleanup)
     return app
@@ -86,8 +93,13 @@ async def on_startup(app):
     node = app['node']
     await node.init_db()
 
+    # Shared HTTP client for peer traffic (heartbeats, replication, recovery, catch-up)
+    app['http'] = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=0, keepalive_timeout=30)
+    )
+
     # Start failure detection
-    rejoin_task = asyncio.create_task(rejoin_sync(node))
+    rejoin_task = asyncio.create_task(rejoin_sync(node, app['http']))
     heartbeat = asyncio.create_task(heartbeat_task(app))
     app['background_tasks'].extend([rejoin_task, heartbeat])
     # Start consensus timers
@@ -95,7 +107,7 @@ async def on_startup(app):
     node.consensus.start()
 
     # Start redundancy catch-up
-    redundancy = RedundancyHandler(node)
+    redundancy = RedundancyHandler(node, app['http'])
     redundancy_task = asyncio.create_task(redundancy.catch_up())
     app['background_tasks'].append(redundancy_task)
 
@@ -110,6 +122,9 @@ async def on_cleanup(app):
         task.cancel()
     if tasks:
         await asyncio.gather(*tasks, return_exceptions=True)
+    await app['node'].time_sync.stop()
+    if 'http' in app:
+        await app['http'].close()
 
 
 def parse_args():
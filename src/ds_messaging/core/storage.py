@@ -1,9 +1,11 @@
+import asyncio
 import json
+import sqlite3
 import time
 from collections import deque
 
 import aiosqlite
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
 
 from src.ds_messaging.failure.detector import FailureDetector
 from src.ds_messaging.time import (
@@ -54,6 +56,18 @@ FROM messages WHERE seq > ? ORDER BY seq ASC;
 
 SELECT_MAX_SEQ = "SELECT IFNULL(MAX(seq), 0) FROM messages;"
 
+SELECT_MSG_COLUMNS = (
+    "SELECT seq, msg_id, sender, recipient, payload, ts, original_ts, corrected_ts, receive_ts, correction_metadata "
+    "FROM messages"
+)
+
+# Group commit: writes arriving within this window share one transaction
+GROUP_COMMIT_DELAY = 0.001
+GROUP_COMMIT_MAX_BATCH = 256
+
+# Python types sqlite3 can bind as query parameters
+_SQLITE_BINDABLE = (type(None), int, float, str, bytes)
+
 INSERT_MSG = """
 INSERT OR IGNORE INTO messages (msg_id, sender, recipient, payload, ts, original_ts, corrected_ts, receive_ts, correction_metadata)
 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
@@ -73,6 +87,9 @@ class Node:
         self.node_id = node_id
         self.base_url = f"http://{host}:{port}"
         self.peers = peers[:]  # list of peer base URLs
+        # endpoint URLs per peer, built once instead of formatted on every request
+        self.replicate_urls = {p: f"{p}/replicate" for p in self.peers}
+        self.sync_urls = {p: f"{p}/sync" for p in self.peers}
 
         # failure detector for heartbeats
         self.failure_detector = FailureDetector(peers)
@@ -82,6 +99,7 @@ class Node:
         self.clock_analyzer = ClockSkewAnalyzer()
         self.timestamp_corrector = TimestampCorrector(self.time_sync, self.clock_analyzer)
         self.message_buffer = MessageOrderingBuffer()
+        self.message_buffer.on_deliver = self._record_delivered
         self.delivered_messages = deque(maxlen=256)
         self.delivery_metrics: Dict[str, Any] = {
             "correction_magnitudes": [],
@@ -109,6 +127,10 @@ class Node:
         # replication consistency tracking
         self.committed_seq = 0
 
+        # group commit queue: (INSERT_MSG row, future resolved after commit)
+        self._write_queue: List[Tuple[Tuple[Any, ...], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
     async def init_db(self):
         self.db = await aiosqlite.connect(self.db_file)
         await self.db.execute(CREATE_SQL)
@@ -160,37 +182,24 @@ class Node:
         Returns a tuple ``(seq, stored_msg, inserted)`` where ``inserted`` is a
         boolean indicating whether a new row was persisted (``False`` implies
         the message was already present, typically through replication).
+
+        Concurrent writes are group-committed: they are queued for about
+        ``GROUP_COMMIT_DELAY`` seconds and persisted with a single
+        ``executemany`` and one commit.
         """
         start = time.time()
-        prepared = self.prepare_message(msg)
-
-        cursor = await self.db.execute(
-            INSERT_MSG,
-            (
-                prepared['msg_id'],
-                prepared['sender'],
-                prepared['recipient'],
-                prepared['payload'],
-                prepared['ts'],
-                prepared['original_ts'],
-                prepared['corrected_ts'],
-                prepared['receive_ts'],
-                json.dumps(prepared.get('correction_info', {})),
-            )
-        )
-        inserted = cursor.rowcount > 0
-        await self.db.commit()
+        # Build and check the row up front so a bad message fails only its own caller
+        row = self._message_row(self.prepare_message(msg))
 
-        cur = await self.db.execute(
-            "SELECT seq, msg_id, sender, recipient, payload, ts, original_ts, corrected_ts, receive_ts, correction_metadata "
-            "FROM messages WHERE msg_id = ?;",
-            (prepared['msg_id'],),
-        )
-        row = await cur.fetchone()
-        stored_msg = self._row_to_message(row)
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._write_queue.append((row, fut))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_writes())
+            self._flush_task.add_done_callback(self._flush_done)
+
+        stored_msg, inserted = await fut
         seq = stored_msg['seq']
-        if 'correction_metadata' in stored_msg:
-            stored_msg.setdefault('correction_info', stored_msg['correction_metadata'])
 
         if inserted:
             self._register_for_ordering(stored_msg)
@@ -200,6 +209,117 @@ class Node:
 
         return seq, stored_msg, inserted
 
+    async def _flush_writes(self) -> None:
+        """Drain the write queue in batches until it is empty."""
+        batch: List[Tuple[Tuple[Any, ...], asyncio.Future]] = []
+        try:
+            await asyncio.sleep(GROUP_COMMIT_DELAY)
+            while self._write_queue:
+                batch = self._write_queue[:GROUP_COMMIT_MAX_BATCH]
+                del self._write_queue[:GROUP_COMMIT_MAX_BATCH]
+                try:
+                    results = await self._write_batch([row for row, _ in batch])
+                except Exception:
+                    # Undo any partial insert, then isolate the failing rows
+                    await self.db.rollback()
+                    await self._write_rows_individually(batch)
+                else:
+                    for (_, fut), result in zip(batch, results):
+                        if not fut.done():
+                            fut.set_result(result)
+                batch = []
+        except asyncio.CancelledError:
+            # The batch in flight is lost with the flush; queued writes are
+            # cancelled by _flush_done
+            for _, fut in batch:
+                fut.cancel()
+            raise
+
+    def _flush_done(self, task: asyncio.Task) -> None:
+        """Flush task callback; also runs if the task was cancelled before it started."""
+        if self._flush_task is not task:
+            return  # a newer flush already owns the queue
+        self._flush_task = None
+        if task.cancelled():
+            # Do not leave writers waiting on a flush that will never run
+            for _, fut in self._write_queue:
+                fut.cancel()
+            self._write_queue.clear()
+
+    async def _write_rows_individually(
+        self, batch: List[Tuple[Tuple[Any, ...], asyncio.Future]]
+    ) -> None:
+        """Fallback after a failed batch: commit each row in its own transaction."""
+        for row, fut in batch:
+            try:
+                [result] = await self._write_batch([row])
+            except Exception as e:
+                await self.db.rollback()
+                if not fut.done():
+                    fut.set_exception(e)
+            else:
+                if not fut.done():
+                    fut.set_result(result)
+
+    @staticmethod
+    def _message_row(prepared: Dict[str, Any]) -> Tuple[Any, ...]:
+        """INSERT_MSG parameters for a prepared message; raises if sqlite cannot bind them."""
+        row = (
+            prepared['msg_id'],
+            prepared['sender'],
+            prepared['recipient'],
+            prepared['payload'],
+            prepared['ts'],
+            prepared['original_ts'],
+            prepared['corrected_ts'],
+            prepared['receive_ts'],
+            json.dumps(prepared.get('correction_info', {})),
+        )
+        for value in row:
+            if not isinstance(value, _SQLITE_BINDABLE):
+                raise sqlite3.ProgrammingError(
+                    f"Error binding parameter: type '{type(value).__name__}' is not supported"
+                )
+        return row
+
+    async def _write_batch(
+        self, batch: List[Tuple[Any, ...]]
+    ) -> List[Tuple[Dict[str, Any], bool]]:
+        """Insert a batch of rows in one transaction; returns ``(stored_msg, inserted)`` per row."""
+        msg_ids = list(dict.fromkeys(row[0] for row in batch))
+        placeholders = ",".join("?" * len(msg_ids))
+
+        cur = await self.db.execute(
+            f"SELECT msg_id FROM messages WHERE msg_id IN ({placeholders});", msg_ids
+        )
+        existing = {row[0] for row in await cur.fetchall()}
+
+        # Only the first occurrence of each new id is written
+        new_rows = {}
+        for row in batch:
+            msg_id = row[0]
+            if msg_id not in existing and msg_id not in new_rows:
+                new_rows[msg_id] = row
+        if new_rows:
+            await self.db.executemany(INSERT_MSG, list(new_rows.values()))
+            await self.db.commit()
+
+        cur = await self.db.execute(
+            f"{SELECT_MSG_COLUMNS} WHERE msg_id IN ({placeholders});", msg_ids
+        )
+        rows = {row[1]: row for row in await cur.fetchall()}
+
+        results = []
+        for row in batch:
+            msg_id = row[0]
+            stored_msg = self._row_to_message(rows[msg_id])
+            if 'correction_metadata' in stored_msg:
+                stored_msg.setdefault('correction_info', stored_msg['correction_metadata'])
+            inserted = msg_id not in existing
+            existing.add(msg_id)
+            results.append((stored_msg, inserted))
+        return results
+
     def prepare_message(self, msg: Dict[str, Any]) -> Dict[str, Any]:
         prepared = dict(msg)
         now = time.time()
@@ -264,8 +384,11 @@ class Node:
         if added:
             deliverable = self.message_buffer.get_deliverable_messages()
             if deliverable:
-                self.delivered_messages.extend(deliverable)
-                self.delivery_metrics['last_delivery_time'] = time.time()
+                self._record_delivered(deliverable)
+
+    def _record_delivered(self, deliverable: List[TimedMessage]) -> None:
+        self.delivered_messages.extend(deliverable)
+        self.delivery_metrics['last_delivery_time'] = time.time()
 
     async def get_messages_since(self, seq):
         """
@@ -303,6 +426,33 @@ class Node:
     ) -> List[Dict[str, Any]]:
         """Fetch committed messages with optional pagination and filtering."""
 
+        query, params = self._committed_messages_query(limit, after_seq, sender, recipient)
+        cur = await self.db.execute(query, params)
+        rows = await cur.fetchall()
+        return [self._row_to_message(r) for r in rows]
+
+    async def iter_committed_messages(
+        self,
+        *,
+        limit: Optional[int] = None,
+        after_seq: Optional[int] = None,
+        sender: Optional[str] = None,
+        recipient: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Like ``get_committed_messages`` but yields rows as the cursor reads them."""
+
+        query, params = self._committed_messages_query(limit, after_seq, sender, recipient)
+        async with self.db.execute(query, params) as cur:
+            async for row in cur:
+                yield self._row_to_message(row)
+
+    def _committed_messages_query(
+        self,
+        limit: Optional[int],
+        after_seq: Optional[int],
+        sender: Optional[str],
+        recipient: Optional[str],
+    ) -> Tuple[str, List[Any]]:
         clauses = ["seq <= ?"]
         params: List[Any] = [self.committed_seq]
 
@@ -324,10 +474,7 @@ class Node:
         if limit is not None:
             query += " LIMIT ?"
             params.append(limit)
-
-        cur = await self.db.execute(query, params)
-        rows = await cur.fetchall()
-        return [self._row_to_message(r) for r in rows]
+        return query, params
 
     async def get_log_entries_since(self, seq: int, limit: int = 32) -> List[Dict[str, Any]]:
         """Return committed log entries with seq greater than ``seq``."""
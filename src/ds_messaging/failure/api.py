@@ -1,22 +1,41 @@
 import logging
 logger = logging.getLogger(__name__)
 from aiohttp import web
+import json
 import time
 import uuid
 import asyncio
+import functools
 import statistics
 from src.ds_messaging.failure.replication import replicate_to_peers, replicate_with_quorum
 
+# Compact encoder for handler responses: no whitespace, and payloads are plain
+# JSON trees so the circular-reference check is skipped
+_dumps = functools.partial(json.dumps, separators=(",", ":"), check_circular=False)
+
+
+def _json_response(data, **kwargs):
+    return web.json_response(data, dumps=_dumps, **kwargs)
+
+
+async def _read_json(request):
+    """Decode the request body from bytes, skipping aiohttp's text decoding step"""
+    return json.loads(await request.read())
+
+
+MAX_MESSAGES_LIMIT = 10000
+MESSAGES_STREAM_CHUNK = 64  # rows per write when streaming /messages
+
 # ---------------------------
 # /send : Producers publish
 # ---------------------------
 async def send_handler(request):
     node = request.app['node']
-    payload = await request.json()
+    payload = await _read_json(request)
     msg_id = payload.get("msg_id") or str(uuid.uuid4())
 
     if node.role != "Leader" and node.leader_url and node.leader_url != node.base_url:
-        return web.json_response(
+        return _json_response(
             {
                 "status": "redirect",
                 "leader_url": node.leader_url,
@@ -42,19 +61,21 @@ async def send_handler(request):
     if node.peers:
         if node.replication_mode == 'async':
             # fire and forget
-            request.app.loop.create_task(replicate_to_peers(node, stored_msg))
+            request.app.loop.create_task(
+                replicate_to_peers(node, stored_msg, request.app['http'])
+            )
             node.commit_message(seq)
         elif node.replication_mode == 'sync_quorum':
-            ok = await replicate_with_quorum(node, stored_msg)
+            ok = await replicate_with_quorum(node, stored_msg, request.app['http'])
             if ok:
                 node.commit_message(seq)
             else:
-                return web.json_response(
+                return _json_response(
                     {"status": "error", "reason": "replication quorum not achieved"},
                     status=503
                 )
 
-    return web.json_response({
+    return _json_response({
         "status": "ok",
         "seq": seq,
         "msg_id": msg_id,
@@ -69,15 +90,15 @@ async def send_handler(request):
 # ---------------------------
 async def replicate_handler(request):
     node = request.app['node']
-    payload = await request.json()
+    payload = await _read_json(request)
     msg = payload.get("msg")
     if not msg:
-        return web.json_response({"status": "bad_request"}, status=400)
+        return _json_response({"status": "bad_request"}, status=400)
 
     seq, stored_msg, inserted = await node.store_message(msg)
     if inserted:
         node.commit_message(seq)  # followers commit immediately
-    return web.json_response({"status": "ok", "seq": seq, "msg_id": stored_msg.get('msg_id')})
+    return _json_response({"status": "ok", "seq": seq, "msg_id": stored_msg.get('msg_id')})
 
 
 # ---------------------------
@@ -86,7 +107,7 @@ async def replicate_handler(request):
 async def heartbeat_handler(request):
     node = request.app['node']
     await asyncio.sleep(0)
-    return web.json_response({"status": "ok", "node_id": node.node_id, "time": time.time()})
+    return _json_response({"status": "ok", "node_id": node.node_id, "time": time.time()})
 
 
 # ---------------------------
@@ -94,10 +115,10 @@ async def heartbeat_handler(request):
 # ---------------------------
 async def sync_handler(request):
     node = request.app['node']
-    payload = await request.json()
+    payload = await _read_json(request)
     since = int(payload.get("since", 0))
     msgs = await node.get_messages_since(since)
-    return web.json_response({"messages": msgs})
+    return _json_response({"messages": msgs})
 
 
 # ---------------------------
@@ -110,7 +131,8 @@ async def messages_handler(request):
         if limit <= 0:
             raise ValueError
     except ValueError:
-        return web.json_response({"status": "bad_request", "reason": "limit must be positive integer"}, status=400)
+        return _json_response({"status": "bad_request", "reason": "limit must be positive integer"}, status=400)
+    limit = min(limit, MAX_MESSAGES_LIMIT)
 
     after_seq = request.query.get("after")
     sender = request.query.get("sender")
@@ -118,15 +140,34 @@ async def messages_handler(request):
     try:
         after_val = int(after_seq) if after_seq is not None else None
     except ValueError:
-        return web.json_response({"status": "bad_request", "reason": "after must be integer"}, status=400)
-
-    msgs = await node.get_committed_messages(
+        return _json_response({"status": "bad_request", "reason": "after must be integer"}, status=400)
+
+    # Stream rows as the cursor yields them so large pages are never held in memory
+    resp = web.StreamResponse()
+    resp.content_type = "application/json"
+    await resp.prepare(request)
+    await resp.write(b'{"messages":[')
+
+    next_after = after_val
+    chunk = []
+    separator = ""
+    async for msg in node.iter_committed_messages(
         limit=limit,
         after_seq=after_val,
         sender=sender,
         recipient=recipient,
-    )
-    return web.json_response({"messages": msgs, "next_after": msgs[-1]['seq'] if msgs else after_val})
+    ):
+        chunk.append(separator + _dumps(msg))
+        separator = ","
+        next_after = msg['seq']
+        if len(chunk) >= MESSAGES_STREAM_CHUNK:
+            await resp.write("".join(chunk).encode())
+            chunk.clear()
+
+    chunk.append(f'],"next_after":{_dumps(next_after)}}}')
+    await resp.write("".join(chunk).encode())
+    await resp.write_eof()
+    return resp
 
 
 # ---------------------------
@@ -143,7 +184,7 @@ async def status_handler(request):
         "node_id": node.node_id,
         "port": node.port,
         "peers": node.peers,
-        "peer_status": node.failure_detector.peer_status,
+        "peer_status": node.failure_detector.status_snapshot(),
         "replication_mode": node.replication_mode,
         "quorum": node.replication_quorum,
         "committed_seq": node.committed_seq,
@@ -170,19 +211,19 @@ async def status_handler(request):
         },
         "time_sync": node.time_sync.get_sync_status() if node.time_sync else {},
     }
-    return web.json_response(status)
+    return _json_response(status)
 
 
 # --- Consensus RPC handlers ---
 async def request_vote_handler(request):
     node = request.app['node']
-    payload = await request.json()
+    payload = await _read_json(request)
     resp = await node.consensus.handle_request_vote(payload)
-    return web.json_response(resp)
+    return _json_response(resp)
 
 
 async def append_entries_handler(request):
     node = request.app['node']
-    payload = await request.json()
+    payload = await _read_json(request)
     resp = await node.consensus.handle_append_entries(payload)
-    return web.json_response(resp)
+    return _json_response(resp)
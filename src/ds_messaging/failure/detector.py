@@ -1,30 +1,79 @@
 import time
-from typing import Dict, List
+from array import array
+from types import MappingProxyType
+from typing import Dict, List, Mapping
 
 
 class FailureDetector:
     def __init__(self, peers: List[str], heartbeat_timeout: float = 6.0):
-        self.peers = peers
+        self.peers = tuple(peers)
         self.heartbeat_timeout = heartbeat_timeout
-        self.peer_status = {p: {"last_ok": 0.0, "alive": False} for p in peers}
+        # Structure-of-arrays peer state, indexed by position in self.peers
+        self._index: Dict[str, int] = {p: i for i, p in enumerate(self.peers)}
+        self.last_ok = array('d', [0.0] * len(self.peers))
+        self.alive = bytearray(len(self.peers))
+
+    @property
+    def peer_status(self) -> Mapping[str, Mapping]:
+        """
+        Read-only per-peer status view ({peer: {"last_ok", "alive"}}).
+        Writing to it raises TypeError; use mark_alive/mark_failed to change state.
+        """
+        return MappingProxyType(
+            {p: MappingProxyType(s) for p, s in self.status_snapshot().items()}
+        )
+
+    def status_snapshot(self) -> Dict[str, Dict]:
+        """Plain-dict copy of per-peer status, e.g. for JSON responses"""
+        return {
+            p: {"last_ok": self.last_ok[i], "alive": bool(self.alive[i])}
+            for i, p in enumerate(self.peers)
+        }
 
     def mark_alive(self, peer: str, timestamp: float):
         """Mark a peer as alive with current timestamp"""
-        self.peer_status[peer] = {"last_ok": timestamp, "alive": True}
+        i = self._index.get(peer)
+        if i is None:
+            i = self._add_peer(peer)
+        self.mark_alive_at(i, timestamp)
+
+    def mark_alive_at(self, index: int, timestamp: float):
+        """Mark the peer at ``index`` in ``self.peers`` as alive"""
+        self.last_ok[index] = timestamp
+        self.alive[index] = 1
+
+    def mark_failed(self, peer: str):
+        """Mark a peer as down until its next successful heartbeat"""
+        i = self._index.get(peer)
+        if i is not None:
+            self.alive[i] = 0
 
     def check_failures(self, current_time: float) -> List[str]:
         """Return list of failed peers based on current time"""
         failed = []
-        for peer, status in self.peer_status.items():
-            if current_time - status["last_ok"] > self.heartbeat_timeout:
-                status["alive"] = False
+        cutoff = current_time - self.heartbeat_timeout
+        last_ok = self.last_ok
+        alive = self.alive
+        for i, peer in enumerate(self.peers):
+            if last_ok[i] < cutoff:
+                alive[i] = 0
                 failed.append(peer)
         return failed
 
     def get_alive_peers(self) -> List[str]:
         """Return list of currently alive peers"""
-        return [p for p, status in self.peer_status.items() if status["alive"]]
+        alive = self.alive
+        return [p for i, p in enumerate(self.peers) if alive[i]]
 
     def is_alive(self, peer: str) -> bool:
         """Check if a specific peer is alive"""
-        return self.peer_status.get(peer, {}).get("alive", False)
\ No newline at end of file
+        i = self._index.get(peer)
+        return i is not None and bool(self.alive[i])
+
+    def _add_peer(self, peer: str) -> int:
+        i = len(self.peers)
+        self.peers += (peer,)
+        self._index[peer] = i
+        self.last_ok.append(0.0)
+        self.alive.append(0)
+        return i
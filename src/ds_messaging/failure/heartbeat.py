@@ -8,44 +8,60 @@ import time
 HEARTBEAT_INTERVAL = 2.0
 HEARTBEAT_TIMEOUT = 6.0  # Add this constant
 
+# Client timeouts built once rather than per request
+HEARTBEAT_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=HEARTBEAT_INTERVAL)
+REJOIN_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=5.0)
+
 
 async def heartbeat_task(app):
     node = app['node']
-    async with aiohttp.ClientSession() as sess:
-        while True:
-            now = time.time()
-            for p in node.peers:
-                try:
-                    async with sess.get(f"{p}/heartbeat", timeout=HEARTBEAT_INTERVAL) as resp:
-                        if resp.status == 200:
-                            node.failure_detector.mark_alive(p, now)  # Use failure_detector
-                except Exception:
-                    # Let the failure detector handle timeouts automatically
-                    pass
-
-            # Check for failures periodically
-            failed_peers = node.failure_detector.check_failures(now)
-            for peer in failed_peers:
-                logger.warning(f"Node {peer} marked as failed - timeout exceeded")
-
-            await asyncio.sleep(HEARTBEAT_INTERVAL)
-
-
-async def rejoin_sync(node):
+    detector = node.failure_detector
+    sess = app['http']
+
+    # (detector index, heartbeat URL) per peer; rebuilt only when the detector
+    # learns a new peer
+    targets = []
+
+    async def _probe(i, url, now):
+        try:
+            async with sess.get(url, timeout=HEARTBEAT_REQUEST_TIMEOUT) as resp:
+                if resp.status == 200:
+                    detector.mark_alive_at(i, now)
+        except Exception:
+            # Let the failure detector handle timeouts automatically
+            pass
+
+    while True:
+        if len(targets) != len(detector.peers):
+            targets = [(i, f"{p}/heartbeat") for i, p in enumerate(detector.peers)]
+        now = time.time()
+        # Probe all peers at once so a dead peer's timeout does not delay the rest
+        await asyncio.gather(*(_probe(i, url, now) for i, url in targets))
+
+        # Check for failures periodically
+        failed_peers = node.failure_detector.check_failures(now)
+        for peer in failed_peers:
+            logger.warning(f"Node {peer} marked as failed - timeout exceeded")
+
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+
+async def rejoin_sync(node, sess: aiohttp.ClientSession):
     max_seq = await node.get_max_seq()
-    async with aiohttp.ClientSession() as sess:
-        alive_peers = node.failure_detector.get_alive_peers()
-        targets = alive_peers if alive_peers else node.peers
-        for p in targets:
-            try:
-                async with sess.post(f"{p}/sync", json={"since": max_seq}, timeout=5.0) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        for m in data.get("messages", []):
-                            seq, _, inserted = await node.store_message(m)
-                            if inserted:
-                                node.commit_message(seq)
-                        node.delivery_metrics['last_recovery_time'] = time.time()
-                        return
-            except Exception:
-                continue
\ No newline at end of file
+    alive_peers = node.failure_detector.get_alive_peers()
+    targets = alive_peers if alive_peers else node.peers
+    for p in targets:
+        # Peers the detector learned after startup have no precomputed URL
+        url = node.sync_urls.get(p) or f"{p}/sync"
+        try:
+            async with sess.post(url, json={"since": max_seq}, timeout=REJOIN_REQUEST_TIMEOUT) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    for m in data.get("messages", []):
+                        seq, _, inserted = await node.store_message(m)
+                        if inserted:
+                            node.commit_message(seq)
+                    node.delivery_metrics['last_recovery_time'] = time.time()
+                    return
+        except Exception:
+            continue
\ No newline at end of file
@@ -1,12 +1,17 @@
 import aiohttp
 import asyncio
+import functools
 import logging
 
 REPL_TIMEOUT = 3.0
+REPL_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=REPL_TIMEOUT)  # built once, shared by all posts
 logger = logging.getLogger(__name__)
 
+# Replication posts still running after quorum returned; held so they are not garbage collected
+_background_posts = set()
 
-async def _post_json(sess, url, data, timeout=REPL_TIMEOUT):
+
+async def _post_json(sess, url, data, timeout=REPL_REQUEST_TIMEOUT):
     """
     Helper: POST JSON data to a peer with timeout.
     Returns JSON response or an Exception.
@@ -19,42 +24,68 @@ async def _post_json(sess, url, data, timeout=REPL_TIMEOUT):
         return e
 
 
-async def replicate_to_peers(node, msg):
+async def replicate_to_peers(node, msg, sess: aiohttp.ClientSession):
     """
     Fire-and-forget replication.
     Leader sends to all alive peers but does not wait for ACKs.
+    ``sess`` is the node's shared client session.
     """
-    async with aiohttp.ClientSession() as sess:
-        alive_peers = node.failure_detector.get_alive_peers()
-        tasks = [_post_json(sess, f"{p}/replicate", {"msg": msg}) for p in alive_peers]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    alive_peers = node.failure_detector.get_alive_peers()
+    urls = node.replicate_urls
+    tasks = [_post_json(sess, urls.get(p) or f"{p}/replicate", {"msg": msg}) for p in alive_peers]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        for p, r in zip(alive_peers, results):
-            if isinstance(r, Exception):
-                # Mark peer as failed if replication fails
-                node.failure_detector.peer_status[p]['alive'] = False
-                logger.warning(f"Replication to {p} failed, marking as down")
+    for p, r in zip(alive_peers, results):
+        if isinstance(r, Exception):
+            # Mark peer as failed if replication fails
+            node.failure_detector.mark_failed(p)
+            logger.warning(f"Replication to {p} failed, marking as down")
 
 
-async def replicate_with_quorum(node, msg):
+async def replicate_with_quorum(node, msg, sess: aiohttp.ClientSession):
     """
     Quorum-based replication.
     Leader sends to all alive peers and waits for enough ACKs.
+    ``sess`` is the node's shared client session.
     """
     needed = node.replication_quorum
     acks = 1  # local write counts
 
-    async with aiohttp.ClientSession() as sess:
-        alive_peers = node.failure_detector.get_alive_peers()
-        tasks = [_post_json(sess, f"{p}/replicate", {"msg": msg}) for p in alive_peers]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    alive_peers = node.failure_detector.get_alive_peers()
+    urls = node.replicate_urls
+    peer_of = {
+        asyncio.create_task(_post_json(sess, urls.get(p) or f"{p}/replicate", {"msg": msg})): p
+        for p in alive_peers
+    }
+    pending = set(peer_of)
 
-        for r in results:
+    # Return as soon as enough peers ACK instead of waiting for the slowest one
+    reached = False
+    while pending and not reached:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            r = task.result()  # _post_json returns failures instead of raising
             if isinstance(r, dict) and r.get("status") == "ok":
                 acks += 1
-                if acks >= needed:
-                    logger.info(f"Replication quorum achieved: {acks}/{needed}")
-                    return True
+                reached = acks >= needed
+        if reached:
+            # Slow peers still get the write; finish their posts in the background
+            for task in pending:
+                _background_posts.add(task)
+                task.add_done_callback(functools.partial(_finish_background_post, peer_of[task]))
+            logger.info(f"Replication quorum achieved: {acks}/{needed}")
+            return True
 
     logger.warning(f"Replication quorum NOT achieved: {acks}/{needed}")
     return False
+
+
+def _finish_background_post(peer, task):
+    """Done callback for a replication post that outlived its quorum wait."""
+    _background_posts.discard(task)
+    if task.cancelled():
+        logger.warning(f"Background replication to {peer} was cancelled")
+        return
+    r = task.result()
+    if not (isinstance(r, dict) and r.get("status") == "ok"):
+        logger.warning(f"Background replication to {peer} failed: {r}")
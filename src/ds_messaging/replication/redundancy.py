@@ -1,43 +1,72 @@
 import aiohttp
 import asyncio
 import logging
+import random
 
 logger = logging.getLogger(__name__)
 
+# Number of synced messages whose stores are overlapped in one gather
+SYNC_CHUNK_SIZE = 100
+
+# Catch-up polling interval bounds (seconds) and +/- jitter fraction
+CATCH_UP_INITIAL_INTERVAL = 5.0
+CATCH_UP_MIN_INTERVAL = 1.0
+CATCH_UP_MAX_INTERVAL = 60.0
+CATCH_UP_JITTER = 0.2
+
 
 class RedundancyHandler:
     """
     Ensures nodes that go offline eventually catch up with peers.
     """
 
-    def __init__(self, node):
+    def __init__(self, node, sess: aiohttp.ClientSession):
         self.node = node
+        self.sess = sess  # the node's shared client session
+        self._interval = CATCH_UP_INITIAL_INTERVAL
 
     async def sync_with_peer(self, peer):
         """
         Fetch missing messages from a peer and apply them locally.
+        Returns the number of newly inserted messages.
         """
+        synced = 0
         try:
             my_seq = await self.node.get_max_seq()
-            async with aiohttp.ClientSession() as session:
-                async with session.post(f"{peer}/sync", json={"since": my_seq}) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        for msg in data.get("messages", []):
-                            seq, _, inserted = await self.node.store_message(msg)
-                            if inserted:
-                                self.node.commit_message(seq)
-                        logger.info(
-                            f"Synced {len(data.get('messages', []))} messages from {peer}"
+            url = self.node.sync_urls.get(peer) or f"{peer}/sync"
+            async with self.sess.post(url, json={"since": my_seq}) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    msgs = data.get("messages", [])
+                    # Overlap stores per chunk; commit_message is synchronous and
+                    # monotonic, so committing the highest inserted seq suffices.
+                    for start in range(0, len(msgs), SYNC_CHUNK_SIZE):
+                        chunk = msgs[start:start + SYNC_CHUNK_SIZE]
+                        results = await asyncio.gather(
+                            *(self.node.store_message(msg) for msg in chunk)
                         )
+                        inserted_seqs = [seq for seq, _, inserted in results if inserted]
+                        if inserted_seqs:
+                            self.node.commit_message(max(inserted_seqs))
+                            synced += len(inserted_seqs)
+                    logger.info("Synced %d messages from %s", len(msgs), peer)
         except Exception as e:
             logger.error(f"Sync with {peer} failed: {e}")
+        return synced
 
     async def catch_up(self):
         """
         Periodically sync with peers to recover missing messages.
+        The interval shrinks while peers still have missing messages and backs
+        off while nothing is missing; jitter keeps nodes from polling in lockstep.
         """
         while True:
-            for peer in self.node.peers:
-                await self.sync_with_peer(peer)
-            await asyncio.sleep(5)
+            results = await asyncio.gather(
+                *(self.sync_with_peer(peer) for peer in self.node.peers)
+            )
+            if any(results):
+                self._interval = max(CATCH_UP_MIN_INTERVAL, self._interval / 2)
+            else:
+                self._interval = min(CATCH_UP_MAX_INTERVAL, self._interval * 1.5)
+            jitter = random.uniform(1 - CATCH_UP_JITTER, 1 + CATCH_UP_JITTER)
+            await asyncio.sleep(self._interval * jitter)
@@ -1,10 +1,45 @@
 import time
+import asyncio
 import logging
+import weakref
+import functools
 from aiohttp import web
 from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# Read-only status endpoints are typically scraped by monitoring probes
+STATUS_CACHE_TTL_MS = 250
+
+
+def ttl_cached(ttl_ms: float):
+    """
+    Cache the JSON body of a read-only handler for ``ttl_ms`` milliseconds.
+    Bursts of monitoring traffic within one window are answered from the
+    already-encoded bytes instead of recomputing the status payload.
+    Only successful responses are cached, per application and query string.
+    """
+    ttl = ttl_ms / 1000.0
+    
+    def decorator(handler):
+        cache = weakref.WeakKeyDictionary()  # app -> (expires_at, query_string, body)
+        
+        @functools.wraps(handler)
+        async def wrapper(request):
+            now = time.monotonic()
+            entry = cache.get(request.app)
+            if entry is not None and now < entry[0] and entry[1] == request.query_string:
+                return web.Response(body=entry[2], content_type="application/json", charset="utf-8")
+            
+            response = await handler(request)
+            if response.status == 200:
+                cache[request.app] = (now + ttl, request.query_string, response.body)
+            return response
+        
+        return wrapper
+    
+    return decorator
+
 
 async def time_handler(request):
     """
@@ -12,16 +47,13 @@ async def time_handler(request):
     Returns server timestamps for clock synchronization.
     """
     node = request.app.get('node')
-    time_sync = getattr(node, 'time_sync', None) if node else None
+    time_sync = getattr(node, 'time_sync', None)
     
     # Record when we received the request
     server_receive_time = time.time()
     
     # Get synchronized time if available
-    if time_sync and hasattr(time_sync, 'get_synchronized_time'):
-        synchronized_time = time_sync.get_synchronized_time()
-    else:
-        synchronized_time = server_receive_time
+    synchronized_time = time_sync.get_synchronized_time() if time_sync else server_receive_time
     
     # Prepare response
     server_send_time = time.time()
@@ -31,39 +63,41 @@ async def time_handler(request):
         "server_send_time": server_send_time,
         "synchronized_time": synchronized_time,
         "local_time": server_send_time,
-        "node_id": getattr(node, 'node_id', 'unknown') if node else 'unknown'
+        "node_id": getattr(node, 'node_id', 'unknown')
     }
     
     # Add synchronization status if available
     if time_sync:
+        clock_offset = time_sync.clock_offset
         response_data.update({
             "is_synchronized": time_sync.is_synchronized(),
-            "clock_offset": time_sync.clock_offset,
+            "clock_offset": clock_offset,
             "sync_accuracy": time_sync.sync_accuracy,
             "last_sync_time": time_sync.last_sync_time
         })
-    
-    logger.debug(f"Time sync request served: offset={time_sync.clock_offset:.6f}s" 
-                if time_sync else "Time sync request served (no sync manager)")
+        logger.debug("Time sync request served: offset=%.6fs", clock_offset)
+    else:
+        logger.debug("Time sync request served (no sync manager)")
     
     return web.json_response(response_data)
 
 
+@ttl_cached(STATUS_CACHE_TTL_MS)
 async def clock_status_handler(request):
     """
     Get detailed clock and synchronization status.
     """
     node = request.app.get('node')
+    time_sync = getattr(node, 'time_sync', None)
     current_time = time.time()
     
     status = {
         "current_time": current_time,
-        "node_id": getattr(node, 'node_id', 'unknown') if node else 'unknown',
+        "node_id": getattr(node, 'node_id', 'unknown'),
         "timestamp": current_time
     }
     
     # Add time synchronization status
-    time_sync = getattr(node, 'time_sync', None) if node else None
     if time_sync:
         status.update({
             "time_synchronization": time_sync.get_sync_status(),
@@ -96,6 +130,24 @@ async def clock_status_handler(request):
     return web.json_response(status)
 
 
+# Manual peer synchronizations currently running, keyed by TimeSync instance
+_inflight_syncs: Dict[Any, asyncio.Task] = {}
+
+
+async def _coalesced_sync(time_sync, node) -> bool:
+    """
+    Run ``synchronize_with_peers`` so overlapping callers share one attempt.
+    At most one manual peer fan-out is active per TimeSync instance.
+    """
+    task = _inflight_syncs.get(time_sync)
+    if task is None:
+        task = asyncio.create_task(time_sync.synchronize_with_peers(node))
+        _inflight_syncs[time_sync] = task
+        task.add_done_callback(lambda _: _inflight_syncs.pop(time_sync, None))
+    # Shield so one disconnecting client does not cancel the shared attempt
+    return await asyncio.shield(task)
+
+
 async def sync_trigger_handler(request):
     """
     Manually trigger time synchronization with peers.
@@ -110,8 +162,9 @@ async def sync_trigger_handler(request):
         )
     
     try:
-        # Trigger synchronization with node context for failure detection
-        success = await time_sync.synchronize_with_peers(node)
+        # Trigger synchronization with node context for failure detection;
+        # concurrent triggers join the attempt already in flight
+        success = await _coalesced_sync(time_sync, node)
         
         if success:
             return web.json_response({
@@ -192,9 +245,12 @@ async def timestamp_correct_handler(request):
         )
 
 
+@ttl_cached(STATUS_CACHE_TTL_MS)
 async def ordering_status_handler(request):
     """
     Get message ordering buffer status and statistics.
+    Pass ``?samples=N`` to include up to N of the next deliverable messages.
+    The buffer is inspected without delivering anything.
     """
     node = request.app.get('node')
     message_buffer = getattr(node, 'message_buffer', None) if node else None
@@ -205,15 +261,23 @@ async def ordering_status_handler(request):
             status=503
         )
     
+    try:
+        sample_count = int(request.query.get('samples', '0'))
+    except ValueError:
+        return web.json_response(
+            {"status": "error", "message": "samples must be an integer"}, 
+            status=400
+        )
+    
     try:
         status = message_buffer.get_buffer_status()
         
         # Add deliverable messages count
-        deliverable_messages = message_buffer.get_deliverable_messages()
-        status["deliverable_messages_count"] = len(deliverable_messages)
+        status["deliverable_messages_count"] = message_buffer.count_deliverable()
         
-        # Add sample of deliverable messages (first 5)
-        if deliverable_messages:
+        # Add sample of deliverable messages only when requested
+        samples = message_buffer.peek_messages(sample_count)
+        if samples:
             status["sample_deliverable_messages"] = [
                 {
                     "msg_id": msg.msg_id,
@@ -221,7 +285,7 @@ async def ordering_status_handler(request):
                     "original_timestamp": msg.original_timestamp,
                     "sender": msg.sender
                 }
-                for msg in deliverable_messages[:5]
+                for msg in samples
             ]
         
         return web.json_response({
@@ -277,23 +341,32 @@ async def force_delivery_handler(request):
         )
 
 
+@ttl_cached(STATUS_CACHE_TTL_MS)
 async def time_stats_handler(request):
     """
     Get comprehensive time-related statistics and metrics.
     """
     node = request.app.get('node')
-    current_time = time.time()
+    time_sync = getattr(node, 'time_sync', None)
+    clock_analyzer = getattr(node, 'clock_analyzer', None)
+    timestamp_corrector = getattr(node, 'timestamp_corrector', None)
+    message_buffer = getattr(node, 'message_buffer', None)
+    
+    # Fetch each component's status exactly once per request
+    sync_status = time_sync.get_sync_status() if time_sync else None
+    skew_stats = clock_analyzer.get_skew_statistics() if clock_analyzer else None
+    if skew_stats is not None and "current_skew" not in skew_stats:
+        skew_stats = None
+    correction_stats = (
+        timestamp_corrector.get_correction_statistics() if timestamp_corrector else None
+    )
+    buffer_stats = message_buffer.get_buffer_status() if message_buffer else None
     
     stats = {
-        "timestamp": current_time,
-        "node_id": getattr(node, 'node_id', 'unknown') if node else 'unknown'
-    }
-    
-    # Time synchronization stats
-    time_sync = getattr(node, 'time_sync', None) if node else None
-    if time_sync:
-        sync_status = time_sync.get_sync_status()
-        stats["synchronization"] = {
+        "timestamp": time.time(),
+        "node_id": getattr(node, 'node_id', 'unknown'),
+        # Time synchronization stats
+        "synchronization": {
             "is_synchronized": sync_status["synchronized"],
             "success_rate": sync_status["success_rate"],
             "attempts": sync_status["sync_attempts"],
@@ -301,49 +374,37 @@ async def time_stats_handler(request):
             "current_offset": sync_status["clock_offset"],
             "accuracy": sync_status["sync_accuracy"],
             "peer_count": len(sync_status.get("peer_offsets", {}))
-        }
-    
-    # Clock skew analysis stats
-    clock_analyzer = getattr(node, 'clock_analyzer', None) if node else None
-    if clock_analyzer:
-        skew_stats = clock_analyzer.get_skew_statistics()
-        if "current_skew" in skew_stats:
-            stats["clock_skew"] = {
-                "current_skew": skew_stats["current_skew"],
-                "drift_rate": skew_stats["drift_rate"],
-                "measurements": skew_stats["measurements"],
-                "std_deviation": skew_stats["std_deviation"],
-                "acceptable": skew_stats["acceptable"],
-                "recommended_sync_interval": clock_analyzer.recommend_sync_interval()
-            }
-    
-    # Timestamp correction stats
-    timestamp_corrector = getattr(node, 'timestamp_corrector', None) if node else None
-    if timestamp_corrector:
-        correction_stats = timestamp_corrector.get_correction_statistics()
-        stats["timestamp_correction"] = {
+        } if sync_status else None,
+        # Clock skew analysis stats
+        "clock_skew": {
+            "current_skew": skew_stats["current_skew"],
+            "drift_rate": skew_stats["drift_rate"],
+            "measurements": skew_stats["measurements"],
+            "std_deviation": skew_stats["std_deviation"],
+            "acceptable": skew_stats["acceptable"],
+            "recommended_sync_interval": clock_analyzer.recommend_sync_interval()
+        } if skew_stats else None,
+        # Timestamp correction stats
+        "timestamp_correction": {
             "corrections_applied": correction_stats["corrections_applied"],
             "average_magnitude": correction_stats["average_correction_magnitude"],
             "max_magnitude": correction_stats["max_correction_magnitude"],
             "method": correction_stats["current_method"]
-        }
-    
-    # Message ordering stats
-    message_buffer = getattr(node, 'message_buffer', None) if node else None
-    if message_buffer:
-        buffer_stats = message_buffer.get_buffer_status()
-        stats["message_ordering"] = {
+        } if correction_stats else None,
+        # Message ordering stats
+        "message_ordering": {
             "buffer_size": buffer_stats["buffer_size"],
             "utilization": buffer_stats["buffer_utilization"],
             "reordered": buffer_stats["messages_reordered"],
             "delivered": buffer_stats["messages_delivered"],
             "reorder_rate": buffer_stats["reorder_rate"],
             "average_age": buffer_stats["average_message_age"]
-        }
+        } if buffer_stats else None,
+    }
     
     return web.json_response({
         "status": "ok",
-        "statistics": stats
+        "statistics": {key: value for key, value in stats.items() if value is not None}
     })
 
 
@@ -1,11 +1,34 @@
 import time
+import bisect
 import logging
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Sequence
 from collections import deque
 import statistics
 
 logger = logging.getLogger(__name__)
 
+# Drift-rate (s/s) bucket boundaries and the sync interval recommended for each
+# bucket: very stable, reasonably stable, moderate drift, high drift.
+_DRIFT_THRESHOLDS = (1e-9, 1e-7, 1e-6)
+_SYNC_INTERVALS = (300.0, 120.0, 60.0, 30.0)
+
+
+class _PeerSkewWindow:
+    """
+    Sliding window of offset measurements for a single peer.
+    Offsets and timestamps live in parallel deques (struct-of-arrays) so the
+    regression and summary statistics can consume them without unpacking tuples.
+    """
+    
+    __slots__ = ("offsets", "timestamps")
+    
+    def __init__(self, window_size: int):
+        self.offsets: deque = deque(maxlen=window_size)
+        self.timestamps: deque = deque(maxlen=window_size)
+    
+    def __len__(self) -> int:
+        return len(self.offsets)
+
 
 class ClockSkewAnalyzer:
     """
@@ -23,13 +46,25 @@ class ClockSkewAnalyzer:
         
         # Skew analysis results
         self.current_skew = 0.0
-        self.drift_rate = 0.0  # Clock drift in seconds per second
+        self.drift_rate = 0.0  # Clock drift in seconds per second (also sets the interval)
         self.last_analysis_time = 0.0
         
         # Peer-specific skew tracking
-        self.peer_skews: Dict[str, deque] = {}
+        self.peer_skews: Dict[str, _PeerSkewWindow] = {}
         self.peer_drift_rates: Dict[str, float] = {}
         
+    @property
+    def drift_rate(self) -> float:
+        return self._drift_rate
+
+    @drift_rate.setter
+    def drift_rate(self, value: float) -> None:
+        # Refresh the cached recommendation whenever drift changes, however it is set
+        self._drift_rate = value
+        self._recommended_interval = _SYNC_INTERVALS[
+            bisect.bisect_right(_DRIFT_THRESHOLDS, abs(value))
+        ]
+
     def record_offset(self, offset: float, timestamp: Optional[float] = None):
         """Record a clock offset measurement for analysis"""
         if timestamp is None:
@@ -50,15 +85,17 @@ class ClockSkewAnalyzer:
         if timestamp is None:
             timestamp = time.time()
             
-        if peer not in self.peer_skews:
-            self.peer_skews[peer] = deque(maxlen=self.window_size)
+        window = self.peer_skews.get(peer)
+        if window is None:
+            window = self.peer_skews[peer] = _PeerSkewWindow(self.window_size)
             
-        self.peer_skews[peer].append((offset, timestamp))
+        window.offsets.append(offset)
+        window.timestamps.append(timestamp)
         
         # Calculate drift rate for this peer
-        if len(self.peer_skews[peer]) >= 3:
+        if len(window) >= 3:
             self.peer_drift_rates[peer] = self._calculate_drift_rate(
-                list(self.peer_skews[peer])
+                window.timestamps, window.offsets
             )
     
     def _analyze_drift(self):
@@ -68,7 +105,7 @@ class ClockSkewAnalyzer:
             
         # Calculate drift rate using linear regression
         self.drift_rate = self._calculate_drift_rate(
-            list(zip(self.offset_history, self.timestamp_history))
+            self.timestamp_history, self.offset_history
         )
         
         self.last_analysis_time = time.time()
@@ -76,16 +113,11 @@ class ClockSkewAnalyzer:
         if abs(self.drift_rate) > 1e-6:  # Significant drift detected
             logger.warning(f"Clock drift detected: {self.drift_rate:.9f} s/s")
     
-    def _calculate_drift_rate(self, data_points: List[Tuple[float, float]]) -> float:
-        """Calculate drift rate using simple linear regression"""
-        if len(data_points) < 2:
+    def _calculate_drift_rate(self, x_values: Sequence[float], y_values: Sequence[float]) -> float:
+        """Calculate drift rate using simple linear regression (x: timestamps, y: offsets)"""
+        n = len(x_values)
+        if n < 2:
             return 0.0
-            
-        # Extract x (time) and y (offset) values
-        x_values = [point[1] for point in data_points]  # timestamps
-        y_values = [point[0] for point in data_points]  # offsets
-        
-        n = len(data_points)
         
         # Calculate means
         x_mean = sum(x_values) / n
@@ -169,9 +201,9 @@ class ClockSkewAnalyzer:
         
         # Add peer-specific statistics
         peer_stats = {}
-        for peer, skews in self.peer_skews.items():
-            if skews:
-                peer_offsets = [s[0] for s in skews]
+        for peer, window in self.peer_skews.items():
+            if window:
+                peer_offsets = window.offsets
                 peer_stats[peer] = {
                     "current_offset": peer_offsets[-1],
                     "drift_rate": self.peer_drift_rates.get(peer, 0.0),
@@ -186,14 +218,8 @@ class ClockSkewAnalyzer:
     
     def recommend_sync_interval(self) -> float:
         """Recommend synchronization interval based on drift analysis"""
-        if abs(self.drift_rate) < 1e-9:  # Very stable clock
-            return 300.0  # 5 minutes
-        elif abs(self.drift_rate) < 1e-7:  # Reasonably stable
-            return 120.0  # 2 minutes
-        elif abs(self.drift_rate) < 1e-6:  # Moderate drift
-            return 60.0   # 1 minute
-        else:  # High drift
-            return 30.0   # 30 seconds
+        # Cached by the drift_rate setter
+        return self._recommended_interval
     
     def reset_analysis(self):
         """Reset all analysis data"""
@@ -203,4 +229,4 @@ class ClockSkewAnalyzer:
         self.peer_drift_rates.clear()
         self.current_skew = 0.0
         self.drift_rate = 0.0
-        self.last_analysis_time = 0.0
\ No newline at end of file
+        self.last_analysis_time = 0.0
@@ -2,14 +2,14 @@ import time
 import heapq
 import asyncio
 import logging
-from typing import Dict, List, Optional, Tuple, Any
-from collections import defaultdict, deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict, defaultdict, deque
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class TimedMessage:
     """Message with timing information for ordering"""
     msg_id: str
@@ -29,12 +29,23 @@ class MessageOrderingBuffer:
     Uses corrected timestamps and implements various ordering strategies.
     """
     
-    def __init__(self, buffer_timeout: float = 5.0, max_buffer_size: int = 1000):
+    def __init__(self, buffer_timeout: float = 5.0, max_buffer_size: int = 1000,
+                 max_delivered_tracking: int = 100_000):
         self.buffer_timeout = buffer_timeout  # Max time to hold messages for reordering
         self.max_buffer_size = max_buffer_size
-        
-        # Message buffer (min-heap based on corrected timestamp)
-        self.message_buffer: List[Tuple[float, TimedMessage]] = []
+        self.max_delivered_tracking = max_delivered_tracking
+        
+        # Message buffer (min-heap of (corrected timestamp, arrival seq, message)).
+        # The arrival sequence breaks timestamp ties so messages are never compared.
+        self.message_buffer: List[Tuple[float, int, TimedMessage]] = []
+        self._seq = 0
+        # msg_id -> live heap entry. The entry doubles as a removal handle: heap
+        # entries no longer referenced here are stale and skipped when they surface.
+        self._entries: Dict[str, Tuple[float, int, TimedMessage]] = {}
+        # Running aggregates of buffered receive timestamps for get_buffer_status;
+        # None means the oldest was removed and must be recomputed on demand
+        self._sum_receive_ts = 0.0
+        self._oldest_receive_ts: Optional[float] = None
         
         # Per-sender ordering buffers for maintaining causal ordering
         self.sender_buffers: Dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
@@ -43,42 +54,64 @@ class MessageOrderingBuffer:
         # Vector clocks for tracking causal relationships
         self.vector_clocks: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
         
-        # Delivered messages tracking (to avoid duplicates)
-        self.delivered_messages: Dict[str, float] = {}  # msg_id -> delivery_time
-        self.delivered_cleanup_interval = 3600.0  # Clean up after 1 hour
+        # Delivered messages tracking (to avoid duplicates), oldest evicted first
+        self.delivered_messages: "OrderedDict[str, float]" = OrderedDict()  # msg_id -> delivery_time
         
         # Statistics
         self.messages_buffered = 0
         self.messages_reordered = 0
         self.messages_delivered = 0
         self.messages_dropped = 0
+        # Highest corrected timestamp handed out so far; later arrivals below it
+        # could not be placed in order and count as reordered
+        self._last_delivered_ts = float("-inf")
+        
+        # Optional delivery callback. When set, a single timer wakes the buffer at
+        # the earliest pending timeout instead of relying on the next arrival.
+        self.on_deliver: Optional[Callable[[List[TimedMessage]], None]] = None
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._wakeup_deadline = float("inf")
         
     def add_message(self, message: TimedMessage) -> bool:
         """
         Add a message to the ordering buffer.
         Returns True if message was added, False if it was a duplicate or invalid.
         """
-        # Check for duplicates
-        if message.msg_id in self.delivered_messages:
+        # Check for duplicates (already delivered or still buffered)
+        if message.msg_id in self.delivered_messages or message.msg_id in self._entries:
             logger.debug(f"Duplicate message ignored: {message.msg_id}")
             return False
         
         # Check buffer size limit
-        if len(self.message_buffer) >= self.max_buffer_size:
+        if self._live_count() >= self.max_buffer_size:
             logger.warning(f"Message buffer full, dropping oldest messages")
             self._cleanup_old_messages(force=True)
         
+        if message.corrected_timestamp < self._last_delivered_ts:
+            self.messages_reordered += 1
+        
         # Add to main buffer with corrected timestamp as priority
-        heapq.heappush(self.message_buffer, (message.corrected_timestamp, message))
+        entry = (message.corrected_timestamp, self._seq, message)
+        self._seq += 1
+        self._entries[message.msg_id] = entry
+        heapq.heappush(self.message_buffer, entry)
         self.messages_buffered += 1
+        self._sum_receive_ts += message.receive_timestamp
+        if len(self._entries) == 1 or (
+            self._oldest_receive_ts is not None
+            and message.receive_timestamp < self._oldest_receive_ts
+        ):
+            self._oldest_receive_ts = message.receive_timestamp
         
         # Update vector clock if provided
         if message.vector_clock:
             self._update_vector_clock(message.sender, message.vector_clock)
         
+        self._schedule_wakeup(message.receive_timestamp + self.buffer_timeout)
+        
         logger.debug(f"Message buffered: {message.msg_id}, "
                     f"corrected_ts={message.corrected_timestamp:.6f}, "
-                    f"buffer_size={len(self.message_buffer)}")
+                    f"buffer_size={self._live_count()}")
         
         return True
     
@@ -90,52 +123,101 @@ class MessageOrderingBuffer:
             current_time = time.time()
         
         deliverable = []
-        remaining_buffer = []
         
-        # Process messages in timestamp order
+        # Process messages in timestamp order: peek at the head, decide, then pop.
+        # Messages that must keep waiting simply stay on the heap.
         while self.message_buffer:
-            timestamp, message = heapq.heappop(self.message_buffer)
+            entry = self.message_buffer[0]
+            message = entry[2]
+            
+            if self._entries.get(message.msg_id) is not entry:
+                # Removed via its handle; discard the stale heap entry
+                heapq.heappop(self.message_buffer)
+                continue
             
             # Check if message has been buffered long enough
             time_in_buffer = current_time - message.receive_timestamp
             
             if time_in_buffer >= self.buffer_timeout:
                 # Timeout reached, deliver regardless of ordering
-                deliverable.append(message)
-                self.messages_delivered += 1
-                self.delivered_messages[message.msg_id] = current_time
-                
                 if time_in_buffer > self.buffer_timeout * 2:
                     logger.warning(f"Message {message.msg_id} delivered after long delay: "
                                  f"{time_in_buffer:.2f}s")
-                
-            elif self._can_deliver_now(message, current_time):
-                # Message can be delivered based on ordering constraints
-                deliverable.append(message)
-                self.messages_delivered += 1
-                self.delivered_messages[message.msg_id] = current_time
-                
-            else:
+            elif not self._can_deliver_now(message, current_time):
                 # Keep in buffer for more reordering
-                remaining_buffer.append((timestamp, message))
-        
-        # Rebuild the heap with remaining messages
-        self.message_buffer = remaining_buffer
-        heapq.heapify(self.message_buffer)
-        
-        # Sort deliverable messages by corrected timestamp for final ordering
-        deliverable.sort(key=lambda m: m.corrected_timestamp)
-        
-        # Count reordered messages
-        for i, msg in enumerate(deliverable):
-            if i > 0 and msg.corrected_timestamp < deliverable[i-1].corrected_timestamp:
-                self.messages_reordered += 1
-        
-        # Cleanup old delivered messages periodically
-        self._cleanup_delivered_messages(current_time)
+                break
+            
+            heapq.heappop(self.message_buffer)
+            del self._entries[message.msg_id]
+            self._forget_receive_ts(message)
+            deliverable.append(message)
+            self.messages_delivered += 1
+            self._mark_delivered(message.msg_id, current_time)
+            if message.corrected_timestamp > self._last_delivered_ts:
+                self._last_delivered_ts = message.corrected_timestamp
+        
+        # Heap pops already yield corrected-timestamp order; no final sort needed
+        if not self._entries:
+            self._cancel_wakeup()
         
         return deliverable
     
+    def count_deliverable(self) -> int:
+        """
+        Count messages a delivery pass would release, without delivering them.
+        Nothing buffered is earlier than the heap head, so the head is always
+        eligible in ``get_deliverable_messages`` and a pass drains the buffer.
+        """
+        return self._live_count()
+    
+    def peek_messages(self, limit: int) -> List[TimedMessage]:
+        """Return up to ``limit`` buffered messages in delivery order without removing them"""
+        if limit <= 0:
+            return []
+        return [entry[2] for entry in heapq.nsmallest(limit, self._entries.values())]
+    
+    def remove_message(self, msg_id: str) -> bool:
+        """
+        Remove a buffered message by id without delivering it.
+        Only the handle is dropped; the heap entry is discarded lazily, so no
+        re-heapify is needed. Returns False if the message is not buffered.
+        """
+        entry = self._entries.pop(msg_id, None)
+        if entry is None:
+            return False
+        self._forget_receive_ts(entry[2])
+        
+        # Compact once stale entries dominate so the heap cannot grow unbounded
+        stale = len(self.message_buffer) - len(self._entries)
+        if stale > 64 and stale > len(self._entries):
+            self.message_buffer = list(self._entries.values())
+            heapq.heapify(self.message_buffer)
+        return True
+    
+    def _forget_receive_ts(self, message: TimedMessage):
+        """Update the receive-time aggregates for a message leaving the buffer"""
+        if not self._entries:
+            self._sum_receive_ts = 0.0
+            self._oldest_receive_ts = None
+            return
+        self._sum_receive_ts -= message.receive_timestamp
+        if message.receive_timestamp == self._oldest_receive_ts:
+            self._oldest_receive_ts = None
+    
+    def _oldest_receive_timestamp(self) -> float:
+        """Earliest receive timestamp among buffered messages (buffer must be non-empty)"""
+        if self._oldest_receive_ts is None:
+            self._oldest_receive_ts = min(message.receive_timestamp for message in self._live_messages())
+        return self._oldest_receive_ts
+    
+    def _live_count(self) -> int:
+        """Number of buffered messages excluding removed entries"""
+        return len(self._entries)
+    
+    def _live_messages(self):
+        """Iterate buffered messages that have not been removed"""
+        return (entry[2] for entry in self._entries.values())
+    
     def _can_deliver_now(self, message: TimedMessage, current_time: float) -> bool:
         """
         Determine if a message can be delivered now based on ordering constraints.
@@ -143,10 +225,11 @@ class MessageOrderingBuffer:
         # For now, use simple timestamp-based ordering with a small window
         # More sophisticated causal ordering can be implemented here
         
-        # Check if there are any messages with earlier timestamps still expected
-        expected_earlier_messages = any(
-            ts < message.corrected_timestamp 
-            for ts, _ in self.message_buffer
+        # Check if there are any messages with earlier timestamps still expected;
+        # the heap head holds the smallest buffered timestamp, so one comparison suffices
+        expected_earlier_messages = (
+            bool(self.message_buffer)
+            and self.message_buffer[0][0] < message.corrected_timestamp
         )
         
         # If no earlier messages expected, or we've waited reasonable time, deliver
@@ -154,62 +237,89 @@ class MessageOrderingBuffer:
         return not expected_earlier_messages or time_in_buffer >= self.buffer_timeout * 0.5
     
     def _update_vector_clock(self, sender: str, message_vector_clock: Dict[str, int]):
-        """Update vector clocks for causal ordering"""
+        """Update vector clocks for causal ordering (element-wise max merge)"""
+        sender_clock = self.vector_clocks[sender]
         for node, clock_value in message_vector_clock.items():
-            self.vector_clocks[sender][node] = max(
-                self.vector_clocks[sender][node], 
-                clock_value
-            )
+            if clock_value > sender_clock.get(node, 0):
+                sender_clock[node] = clock_value
     
     def _cleanup_old_messages(self, force: bool = False):
         """Remove old messages from buffer to prevent memory issues"""
         current_time = time.time()
         cutoff_time = current_time - (self.buffer_timeout * 3)
         
-        if force or len(self.message_buffer) > self.max_buffer_size * 0.8:
+        live_count = self._live_count()
+        if force or live_count > self.max_buffer_size * 0.8:
             # Remove oldest 10% of messages or messages older than cutoff
-            to_remove = max(1, len(self.message_buffer) // 10)
-            
-            # Sort by receive time and remove oldest
-            self.message_buffer.sort(key=lambda x: x[1].receive_timestamp)
+            to_remove = max(1, live_count // 10)
             
-            for _ in range(min(to_remove, len(self.message_buffer))):
-                if self.message_buffer:
-                    _, old_msg = self.message_buffer.pop(0)
-                    self.messages_dropped += 1
-                    logger.warning(f"Dropped old message: {old_msg.msg_id}")
-            
-            # Rebuild heap
-            heapq.heapify(self.message_buffer)
+            # Remove the oldest by receive time through their handles; the heap is
+            # left untouched and stale entries are discarded when they reach the head
+            oldest = heapq.nsmallest(
+                to_remove, self._live_messages(), key=lambda message: message.receive_timestamp
+            )
+            for old_msg in oldest:
+                self.remove_message(old_msg.msg_id)
+                self.messages_dropped += 1
+                logger.warning(f"Dropped old message: {old_msg.msg_id}")
+    
+    def _schedule_wakeup(self, deadline: float):
+        """
+        Arrange a delivery pass at ``deadline`` (wall-clock seconds). Only one timer
+        is kept: an earlier pending wakeup already covers later deadlines.
+        """
+        if self.on_deliver is None or deadline >= self._wakeup_deadline:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        
+        self._cancel_wakeup()
+        delay = max(0.0, deadline - time.time())
+        self._wakeup = loop.call_at(loop.time() + delay, self._deadline_wake)
+        self._wakeup_deadline = deadline
     
-    def _cleanup_delivered_messages(self, current_time: float):
-        """Clean up old delivered message records"""
-        cutoff_time = current_time - self.delivered_cleanup_interval
+    def _cancel_wakeup(self):
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        self._wakeup_deadline = float("inf")
+    
+    def _deadline_wake(self):
+        """Timer callback: deliver what is due and re-arm for the next deadline"""
+        self._wakeup = None
+        self._wakeup_deadline = float("inf")
         
-        to_remove = [
-            msg_id for msg_id, delivery_time in self.delivered_messages.items()
-            if delivery_time < cutoff_time
-        ]
+        deliverable = self.get_deliverable_messages()
+        if deliverable and self.on_deliver is not None:
+            self.on_deliver(deliverable)
         
-        for msg_id in to_remove:
-            del self.delivered_messages[msg_id]
+        if self._entries:
+            self._schedule_wakeup(self._oldest_receive_timestamp() + self.buffer_timeout)
+    
+    def _mark_delivered(self, msg_id: str, delivery_time: float):
+        """Record a delivery, forgetting the oldest record once the cap is reached"""
+        self.delivered_messages[msg_id] = delivery_time
+        if len(self.delivered_messages) > self.max_delivered_tracking:
+            self.delivered_messages.popitem(last=False)
     
     def get_buffer_status(self) -> Dict[str, Any]:
         """Get current buffer status for monitoring"""
         current_time = time.time()
         
-        # Calculate average age of buffered messages
-        if self.message_buffer:
-            ages = [current_time - msg.receive_timestamp for _, msg in self.message_buffer]
-            avg_age = sum(ages) / len(ages)
-            max_age = max(ages)
+        # Average and maximum age of buffered messages from the running aggregates
+        buffer_size = self._live_count()
+        if buffer_size:
+            avg_age = current_time - self._sum_receive_ts / buffer_size
+            max_age = current_time - self._oldest_receive_timestamp()
         else:
             avg_age = max_age = 0.0
         
         return {
-            "buffer_size": len(self.message_buffer),
+            "buffer_size": buffer_size,
             "max_buffer_size": self.max_buffer_size,
-            "buffer_utilization": len(self.message_buffer) / self.max_buffer_size,
+            "buffer_utilization": buffer_size / self.max_buffer_size,
             "average_message_age": avg_age,
             "max_message_age": max_age,
             "messages_buffered": self.messages_buffered,
@@ -226,12 +336,20 @@ class MessageOrderingBuffer:
         current_time = time.time()
         
         while self.message_buffer:
-            _, message = heapq.heappop(self.message_buffer)
+            entry = heapq.heappop(self.message_buffer)
+            message = entry[2]
+            if self._entries.get(message.msg_id) is not entry:
+                continue
             messages.append(message)
-            self.delivered_messages[message.msg_id] = current_time
+            self._mark_delivered(message.msg_id, current_time)
+        self._entries.clear()
+        self._sum_receive_ts = 0.0
+        self._oldest_receive_ts = None
+        self._cancel_wakeup()
         
-        messages.sort(key=lambda m: m.corrected_timestamp)
         self.messages_delivered += len(messages)
+        if messages and messages[-1].corrected_timestamp > self._last_delivered_ts:
+            self._last_delivered_ts = messages[-1].corrected_timestamp
         
         return messages
 
@@ -246,39 +364,110 @@ class CausalOrderingManager:
         self.node_id = node_id
         self.vector_clock: Dict[str, int] = defaultdict(int)
         self.pending_messages: Dict[str, List[TimedMessage]] = defaultdict(list)
+        # msg_id -> dependency that blocked the last delivery check. Local clock
+        # entries only grow, so the full check is skipped until it is satisfied.
+        self._blocked_on: Dict[str, Tuple[str, float]] = {}
+        
+        # Delta encoding of vector clocks on the wire (anchor + delta per peer)
+        self._last_sent_clock: Dict[str, Dict[str, int]] = {}
+        self._sent_versions: Dict[str, int] = {}
+        self._last_received_clock: Dict[str, Dict[str, int]] = {}
+        self._received_versions: Dict[str, int] = {}
         
     def increment_clock(self):
         """Increment local clock for outgoing message"""
         self.vector_clock[self.node_id] += 1
     
+    def encode_clock_for(self, recipient: str) -> Dict[str, Any]:
+        """
+        Encode the local vector clock for a recipient as a delta.
+        Only entries that changed since the last clock sent to ``recipient`` are
+        included; ``anchor`` names the version the delta applies to (0 means the
+        delta is a full clock).
+        """
+        last_sent = self._last_sent_clock.get(recipient, {})
+        delta = {
+            node: value for node, value in self.vector_clock.items()
+            if last_sent.get(node, 0) != value
+        }
+        anchor = self._sent_versions.get(recipient, 0)
+        self._last_sent_clock[recipient] = dict(self.vector_clock)
+        self._sent_versions[recipient] = anchor + 1
+        return {"anchor": anchor, "delta": delta}
+    
+    def reset_clock_encoding(self, recipient: str):
+        """Send a full clock to ``recipient`` next time (e.g. after it lost a delta)"""
+        self._last_sent_clock.pop(recipient, None)
+        self._sent_versions.pop(recipient, None)
+    
+    def decode_clock_from(self, sender: str, encoded: Dict[str, Any]) -> Optional[Dict[str, int]]:
+        """
+        Rebuild the full vector clock of ``sender`` from ``encode_clock_for`` output.
+        Returns None if the anchor does not match the last clock received from
+        the sender (a delta was lost or reordered); the sender should then be
+        asked to reset its encoding and send a full clock.
+        """
+        anchor = int(encoded.get("anchor", 0))
+        if anchor == 0:
+            base: Dict[str, int] = {}
+        elif anchor == self._received_versions.get(sender):
+            base = self._last_received_clock[sender]
+        else:
+            return None
+        
+        clock = dict(base)
+        clock.update(encoded.get("delta") or {})
+        self._last_received_clock[sender] = clock
+        self._received_versions[sender] = anchor + 1
+        return dict(clock)
+    
     def update_clock(self, sender_clock: Dict[str, int]):
         """Update vector clock based on received message"""
+        local_clock = self.vector_clock
+        node_id = self.node_id
+        
+        # Element-wise max merge; only entries that advance are written
         for node, clock_value in sender_clock.items():
-            if node != self.node_id:
-                self.vector_clock[node] = max(self.vector_clock[node], clock_value)
+            if clock_value > local_clock.get(node, 0) and node != node_id:
+                local_clock[node] = clock_value
         
         # Increment local clock
-        self.vector_clock[self.node_id] += 1
+        local_clock[node_id] += 1
     
     def can_deliver(self, message: TimedMessage) -> bool:
         """Check if message can be delivered based on causal ordering"""
-        if not message.vector_clock:
-            return True  # No causal constraints
+        return self._blocking_dependency(message) is None
+    
+    def _blocking_dependency(self, message: TimedMessage) -> Optional[Tuple[str, float]]:
+        """
+        Return (node, value) such that the message cannot be delivered before the
+        local clock entry for ``node`` reaches ``value``, or None if deliverable.
+        """
+        message_clock = message.vector_clock
+        if not message_clock:
+            return None  # No causal constraints
         
         sender = message.sender
-        
-        # Check causal ordering constraints
-        for node, clock_value in message.vector_clock.items():
-            if node == sender:
-                # Sender's clock should be exactly one more than our last from sender
-                if clock_value != self.vector_clock[sender] + 1:
-                    return False
-            else:
-                # Other nodes' clocks should not be ahead of ours
-                if clock_value > self.vector_clock[node]:
-                    return False
-        
-        return True
+        local_clock = self.vector_clock
+        
+        # Sender's clock should be exactly one more than our last from sender.
+        # Checked first since it is the constraint pending messages usually fail.
+        sender_value = message_clock.get(sender)
+        if sender_value is not None:
+            local_sender = local_clock.get(sender, 0)
+            if sender_value > local_sender + 1:
+                return (sender, sender_value - 1)
+            if sender_value <= local_sender:
+                # Already past this event; clocks never move back
+                return (sender, float("inf"))
+        
+        # Other nodes' clocks should not be ahead of ours. Using .get() keeps
+        # the read-only check from inserting zero entries into the defaultdict.
+        for node, clock_value in message_clock.items():
+            if clock_value > local_clock.get(node, 0) and node != sender:
+                return (node, clock_value)
+        
+        return None
     
     def add_pending_message(self, message: TimedMessage):
         """Add message to pending queue for causal ordering"""
@@ -287,17 +476,27 @@ class CausalOrderingManager:
     def get_deliverable_messages(self) -> List[TimedMessage]:
         """Get messages that can be delivered according to causal ordering"""
         deliverable = []
+        local_clock = self.vector_clock
+        blocked_on = self._blocked_on
         
         for sender in list(self.pending_messages.keys()):
             messages = self.pending_messages[sender]
             still_pending = []
             
             for message in messages:
-                if self.can_deliver(message):
+                blocker = blocked_on.get(message.msg_id)
+                if blocker is not None and local_clock.get(blocker[0], 0) < blocker[1]:
+                    still_pending.append(message)
+                    continue
+                
+                blocker = self._blocking_dependency(message)
+                if blocker is None:
+                    blocked_on.pop(message.msg_id, None)
                     deliverable.append(message)
                     if message.vector_clock:
                         self.update_clock(message.vector_clock)
                 else:
+                    blocked_on[message.msg_id] = blocker
                     still_pending.append(message)
             
             if still_pending:
@@ -1,12 +1,25 @@
 import time
+import json
 import asyncio
 import aiohttp
 import logging
-from typing import Dict, List, Optional, Tuple
-from statistics import median
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Deadlines for a single NTP-style exchange with a peer
+SYNC_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=5.0, connect=1.0, sock_read=2.0)
+
+
+def _median_in_place(values: List[float]) -> float:
+    """Median of a non-empty list of floats; sorts ``values`` in place."""
+    values.sort()
+    mid = len(values) // 2
+    if len(values) % 2:
+        return values[mid]
+    return (values[mid - 1] + values[mid]) / 2
+
 
 class TimeSync:
     """
@@ -14,38 +27,57 @@ class TimeSync:
     Handles clock offset calculation, network delay compensation, and synchronization accuracy.
     """
     
-    def __init__(self, peers: List[str], sync_interval: float = 30.0, max_offset: float = 1.0):
+    def __init__(self, peers: List[str], sync_interval: float = 30.0, max_offset: float = 1.0,
+                 max_concurrent_syncs: int = 8):
         self.peers = peers
         self.sync_interval = sync_interval
         self.max_offset = max_offset  # Maximum acceptable clock offset in seconds
         
+        # Bound in-flight peer exchanges so queueing does not inflate measured delays
+        self._sync_semaphore = asyncio.Semaphore(max_concurrent_syncs)
+        
         # Synchronization state
         self.clock_offset = 0.0  # Offset to add to local time to get synchronized time
         self.network_delay = 0.0  # Estimated network delay
         self.last_sync_time = 0.0
+        # Monotonic reading taken alongside last_sync_time; elapsed-time checks use
+        # it so wall-clock steps cannot make the last sync look older or newer
+        self._mono_last_sync: Optional[float] = None
+        # Rounds are numbered as they start; current state comes from _published_round
+        self._round_counter = 0
+        self._published_round = 0
         self.sync_accuracy = 0.0  # Estimated synchronization accuracy
         
         # Drift rate computation
         self.drift_rate = 0.0  # Clock drift in seconds per second
-        self.offset_history: List[Tuple[float, float]] = []  # (timestamp, offset) pairs
         self.max_history_size = 20  # Keep last 20 measurements for drift calculation
+        # (timestamp, offset) pairs; the bounded deque evicts the oldest in O(1)
+        self.offset_history: Deque[Tuple[float, float]] = deque(maxlen=self.max_history_size)
         
         # Peer time data
         self.peer_offsets: Dict[str, float] = {}
         self.peer_delays: Dict[str, float] = {}
         self.peer_last_sync: Dict[str, float] = {}
+        # Snapshots of peer_offsets/peer_delays handed out by get_sync_status,
+        # rebuilt only after a sync round changed them
+        self._peer_snapshot: Optional[Tuple[Dict[str, float], Dict[str, float]]] = None
         
         # Statistics
         self.sync_attempts = 0
         self.successful_syncs = 0
         
+        # Long-lived HTTP session so peer connections are kept alive between syncs
+        self._session: Optional[aiohttp.ClientSession] = None
+        
     def get_synchronized_time(self) -> float:
         """Get current synchronized time accounting for calculated offset"""
         return time.time() + self.clock_offset
     
     def is_synchronized(self) -> bool:
         """Check if the clock is currently synchronized within acceptable bounds"""
-        time_since_sync = time.time() - self.last_sync_time
+        if self._mono_last_sync is None:
+            return False
+        time_since_sync = time.monotonic() - self._mono_last_sync
         return time_since_sync < self.sync_interval * 2 and abs(self.clock_offset) < self.max_offset
     
     async def sync_with_peer(self, peer: str, session: aiohttp.ClientSession) -> Optional[Tuple[float, float]]:
@@ -54,37 +86,47 @@ class TimeSync:
         Returns (offset, delay) tuple or None if synchronization fails.
         """
         try:
-            # Record timestamps for NTP-style calculation
-            t1 = time.time()  # Client send time
-            
-            async with session.get(f"{peer}/time", timeout=5.0) as resp:
-                if resp.status != 200:
-                    return None
-                    
-                t4 = time.time()  # Client receive time
-                data = await resp.json()
-                
-                t2 = data.get('server_receive_time', t1)  # Server receive time
-                t3 = data.get('server_send_time', t4)     # Server send time
-                
-                # NTP offset and delay calculation
-                # offset = ((t2 - t1) + (t3 - t4)) / 2
-                # delay = (t4 - t1) - (t3 - t2)
-                offset = ((t2 - t1) + (t3 - t4)) / 2
-                delay = (t4 - t1) - (t3 - t2)
-                
-                # Validate measurements
-                if delay < 0 or delay > 1.0:  # Reject unrealistic delays
-                    logger.warning(f"Rejected time sync with {peer}: invalid delay {delay}")
-                    return None
-                
-                logger.debug(f"Time sync with {peer}: offset={offset:.6f}s, delay={delay:.6f}s")
-                return (offset, delay)
-                
+            async with self._sync_semaphore:
+                return await self._measure_peer(peer, session)
         except Exception as e:
             logger.warning(f"Time sync with {peer} failed: {e}")
             return None
     
+    async def _measure_peer(self, peer: str, session: aiohttp.ClientSession) -> Optional[Tuple[float, float]]:
+        """Run one timed request/response exchange with a peer."""
+        # Record timestamps for NTP-style calculation. Wall-clock readings feed the
+        # offset; the round trip is timed on the monotonic clock so clock steps
+        # between send and receive cannot corrupt the delay.
+        t1 = time.time()  # Client send time
+        t1_mono = time.monotonic_ns()
+        
+        async with session.get(f"{peer}/time", timeout=SYNC_REQUEST_TIMEOUT) as resp:
+            if resp.status != 200:
+                return None
+                
+            t4_mono = time.monotonic_ns()
+            t4 = time.time()  # Client receive time
+            # Parse the raw bytes directly; skips aiohttp's content-type check and
+            # text decoding. t4 is taken first so parsing never inflates delay.
+            data = json.loads(await resp.read())
+            
+            t2 = data.get('server_receive_time', t1)  # Server receive time
+            t3 = data.get('server_send_time', t4)     # Server send time
+            
+            # NTP offset and delay calculation
+            # offset = ((t2 - t1) + (t3 - t4)) / 2
+            # delay = (t4 - t1) - (t3 - t2)
+            offset = ((t2 - t1) + (t3 - t4)) / 2
+            delay = (t4_mono - t1_mono) / 1e9 - (t3 - t2)
+            
+            # Validate measurements
+            if delay < 0 or delay > 1.0:  # Reject unrealistic delays
+                logger.warning(f"Rejected time sync with {peer}: invalid delay {delay}")
+                return None
+            
+            logger.debug(f"Time sync with {peer}: offset={offset:.6f}s, delay={delay:.6f}s")
+            return (offset, delay)
+    
     async def synchronize_with_peers(self, node=None) -> bool:
         """
         Synchronize time with all available peers using NTP-style algorithm.
@@ -104,40 +146,53 @@ class TimeSync:
             logger.debug(f"Time sync targeting {len(target_peers)} alive peers out of {len(self.peers)} total")
         
         self.sync_attempts += 1
-        valid_measurements = []
+        offsets: List[float] = []
+        delays: List[float] = []
         
-        async with aiohttp.ClientSession() as session:
-            # Collect time measurements from alive peers only
-            tasks = [self.sync_with_peer(peer, session) for peer in target_peers]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
+        # Collect time measurements from alive peers only
+        self._round_counter += 1
+        round_id = self._round_counter
+        session = self._get_session()
+        tasks = [self.sync_with_peer(peer, session) for peer in target_peers]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # One clock reading for every timestamp this round records
+        now = time.time()
+        
+        if node and hasattr(node, 'failure_detector'):
             for peer, result in zip(target_peers, results):
-                if isinstance(result, tuple) and result is not None:
-                    offset, delay = result
-                    valid_measurements.append((offset, delay))
-                    self.peer_offsets[peer] = offset
-                    self.peer_delays[peer] = delay
-                    self.peer_last_sync[peer] = time.time()
-                elif node and hasattr(node, 'failure_detector'):
-                    # Mark peer as failed if sync fails (like replication module)
-                    if peer in node.failure_detector.peer_status:
-                        node.failure_detector.peer_status[peer]['alive'] = False
-                        logger.debug(f"Marked peer {peer} as failed due to sync failure")
+                # Mark peer as failed if sync fails (like replication module)
+                if not isinstance(result, tuple) and node.failure_detector.is_alive(peer):
+                    node.failure_detector.mark_failed(peer)
+                    logger.debug(f"Marked peer {peer} as failed due to sync failure")
         
-        if not valid_measurements:
-            logger.warning("No valid time measurements obtained from peers")
+        # Overlapping rounds: a round that started after this one has already
+        # published newer state, so drop these stale measurements
+        if round_id < self._published_round:
+            logger.debug("Discarding stale time sync round superseded by a newer one")
             return False
         
-        # Calculate consensus offset using median (more robust than mean)
-        offsets = [m[0] for m in valid_measurements]
-        delays = [m[1] for m in valid_measurements]
+        for peer, result in zip(target_peers, results):
+            if isinstance(result, tuple):
+                offset, delay = result
+                offsets.append(offset)
+                delays.append(delay)
+                self.peer_offsets[peer] = offset
+                self.peer_delays[peer] = delay
+                self.peer_last_sync[peer] = now
+                self._peer_snapshot = None
+        
+        if not offsets:
+            logger.warning("No valid time measurements obtained from peers")
+            return False
         
         # Use median for both offset and delay for robustness against outliers
-        consensus_offset = median(offsets)
-        median_delay = median(delays)
+        # (more robust than mean)
+        consensus_offset = _median_in_place(offsets)
+        median_delay = _median_in_place(delays)
         
         # Update synchronization state
-        current_sync_time = time.time()
+        current_sync_time = now
+        self._published_round = round_id
         self.clock_offset = consensus_offset
         self.network_delay = median_delay
         
@@ -145,6 +200,7 @@ class TimeSync:
         self._update_drift_rate(consensus_offset, current_sync_time)
         
         self.last_sync_time = current_sync_time
+        self._mono_last_sync = time.monotonic()
         self.successful_syncs += 1
         
         # Calculate synchronization accuracy (standard deviation of offsets)
@@ -157,7 +213,7 @@ class TimeSync:
         
         logger.info(f"Time synchronized: offset={consensus_offset:.6f}s, "
                    f"accuracy={self.sync_accuracy:.6f}s, drift={self.drift_rate:.9f}s/s, "
-                   f"peers={len(valid_measurements)}")
+                   f"peers={len(offsets)}")
         
         return True
     
@@ -166,31 +222,30 @@ class TimeSync:
         Update drift rate calculation based on offset history using linear regression.
         This helps predict future clock behavior and improve synchronization accuracy.
         """
-        # Add current measurement to history
+        # Add current measurement to history (oldest evicted automatically)
         self.offset_history.append((timestamp, offset))
         
-        # Keep only recent measurements
-        if len(self.offset_history) > self.max_history_size:
-            self.offset_history.pop(0)
-        
         # Need at least 3 points for meaningful drift calculation
         if len(self.offset_history) < 3:
             self.drift_rate = 0.0
             return
         
-        # Calculate drift rate using linear regression (similar to ClockSkewAnalyzer)
-        timestamps = [point[0] for point in self.offset_history]
-        offsets = [point[1] for point in self.offset_history]
-        
+        # Calculate drift rate using linear regression (similar to ClockSkewAnalyzer).
+        # Closed-form least squares accumulated in a single pass; timestamps are
+        # taken relative to the oldest sample to keep the sums well conditioned.
         n = len(self.offset_history)
-        
-        # Calculate means
-        t_mean = sum(timestamps) / n
-        o_mean = sum(offsets) / n
+        t0 = self.offset_history[0][0]
+        sum_t = sum_o = sum_tt = sum_to = 0.0
+        for t, o in self.offset_history:
+            t -= t0
+            sum_t += t
+            sum_o += o
+            sum_tt += t * t
+            sum_to += t * o
         
         # Calculate slope (drift rate) using least squares
-        numerator = sum((t - t_mean) * (o - o_mean) for t, o in zip(timestamps, offsets))
-        denominator = sum((t - t_mean) ** 2 for t in timestamps)
+        numerator = sum_to - sum_t * sum_o / n
+        denominator = sum_tt - sum_t * sum_t / n
         
         if denominator > 0:
             self.drift_rate = numerator / denominator
@@ -206,20 +261,39 @@ class TimeSync:
         Predict clock offset at a future time based on computed drift rate.
         Useful for timestamp correction and proactive synchronization.
         """
-        if future_time is None:
-            future_time = time.time()
-        
         if not self.offset_history:
             return self.clock_offset
         
-        # Calculate time elapsed since last synchronization
-        time_diff = future_time - self.last_sync_time
+        # Calculate time elapsed since last synchronization; "now" is measured on
+        # the monotonic clock, explicit wall-clock times against last_sync_time
+        if future_time is None and self._mono_last_sync is not None:
+            time_diff = time.monotonic() - self._mono_last_sync
+        else:
+            if future_time is None:
+                future_time = time.time()
+            time_diff = future_time - self.last_sync_time
         
         # Predict offset accounting for drift
         predicted_offset = self.clock_offset + (self.drift_rate * time_diff)
         
         return predicted_offset
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared peer session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=max(1, len(self.peers)),
+                keepalive_timeout=60,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+    
+    async def stop(self):
+        """Close the shared peer session (called on application cleanup)"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
     async def sync_task(self, app):
         """Background task for periodic time synchronization"""
         node = app.get('node')
@@ -232,7 +306,14 @@ class TimeSync:
             await asyncio.sleep(self.sync_interval)
     
     def get_sync_status(self) -> Dict:
-        """Get current synchronization status for monitoring"""
+        """
+        Get current synchronization status for monitoring.
+        The peer dicts are shared snapshots reused until the next sync round
+        updates them; callers must treat them as read-only.
+        """
+        if self._peer_snapshot is None:
+            self._peer_snapshot = (dict(self.peer_offsets), dict(self.peer_delays))
+        peer_offsets, peer_delays = self._peer_snapshot
         return {
             "synchronized": self.is_synchronized(),
             "clock_offset": self.clock_offset,
@@ -245,8 +326,8 @@ class TimeSync:
             "sync_attempts": self.sync_attempts,
             "successful_syncs": self.successful_syncs,
             "success_rate": self.successful_syncs / max(1, self.sync_attempts),
-            "peer_offsets": self.peer_offsets.copy(),
-            "peer_delays": self.peer_delays.copy()
+            "peer_offsets": peer_offsets,
+            "peer_delays": peer_delays
         }
     
     def estimate_peer_time(self, peer: str, local_time: Optional[float] = None) -> Optional[float]:
@@ -1,8 +1,8 @@
 import math
 import time
-import statistics
+from collections import deque
 from enum import Enum
-from typing import Dict, Optional, Tuple, List
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
 
 
 class TimestampCorrectionMethod(str, Enum):
@@ -30,19 +30,43 @@ class TimestampCorrector:
         method: TimestampCorrectionMethod = TimestampCorrectionMethod.HYBRID,
         max_future_skew: float = 5.0,
         max_past_skew: float = 60.0,
+        history_window: int = 4096,
+        correction_tolerance: float = 1e-3,
     ) -> None:
         self.time_sync = time_sync
         self.clock_analyzer = clock_analyzer
-        self.method = method
+        self.method = method  # normalised to TimestampCorrectionMethod by the setter
         self.max_future_skew = max_future_skew
         self.max_past_skew = max_past_skew
+        self.history_window = history_window
+        # Offsets smaller than this are within sync noise and are not applied
+        self.correction_tolerance = correction_tolerance
+        # Method -> offset function, looked up once per correction
+        self._offset_strategies: Dict[TimestampCorrectionMethod, Callable[[float, float, float], float]] = {
+            TimestampCorrectionMethod.OFFSET: self._offset_only,
+            TimestampCorrectionMethod.DRIFT_COMPENSATED: self._offset_drift_compensated,
+            TimestampCorrectionMethod.HYBRID: self._offset_hybrid,
+        }
 
         # Statistics
         self.corrections_applied = 0
         self.total_correction_magnitude = 0.0
         self.max_correction_magnitude = 0.0
-        self.correction_history: List[Tuple[float, float]]
-        self.correction_history = []  # (original, corrected)
+        # Welford running mean / sum of squared deviations of magnitudes
+        self._magnitude_mean = 0.0
+        self._magnitude_m2 = 0.0
+        # Sliding window of (original, corrected) pairs; memory stays bounded
+        self.correction_history: Deque[Tuple[float, float]]
+        self.correction_history = deque(maxlen=history_window)
+
+    @property
+    def method(self) -> TimestampCorrectionMethod:
+        return self._method
+
+    @method.setter
+    def method(self, value) -> None:
+        # Accept plain strings such as "offset"; strategy lookup is keyed by the enum
+        self._method = TimestampCorrectionMethod(value)
 
     # ------------------------------------------------------------------
     # Validation & correction helpers
@@ -69,31 +93,84 @@ class TimestampCorrector:
 
         return True, "ok"
 
-    def _compute_offset(self, original_timestamp: float) -> float:
+    def validate_batch(self, timestamps: Sequence[Optional[float]]) -> List[bool]:
+        """Validate many timestamps against one clock reading.
+
+        Returns one flag per timestamp, True where ``validate_timestamp`` would
+        accept it. The plausibility window is computed once for the batch.
+        """
+        now = time.time()
+        latest = now + self.max_future_skew
+        earliest = now - self.max_past_skew
+
+        results = []
+        for timestamp in timestamps:
+            try:
+                timestamp = float(timestamp)
+            except (TypeError, ValueError):
+                results.append(False)
+                continue
+            results.append(earliest <= timestamp <= latest)
+        return results
+
+    def _compute_offset(self, original_timestamp: float, now: Optional[float] = None) -> float:
         """Derive an offset using the configured method."""
-        offset = self.time_sync.clock_offset if self.time_sync else 0.0
+        if now is None:
+            now = time.time()
+        offset, drift = self._sample_clock(now)
+        return self._offset_strategies[self._method](original_timestamp, offset, drift)
+
+    def _sample_clock(self, now: float) -> Tuple[float, float]:
+        """Current offset and drift rate; drift-aware methods record the offset."""
+        time_sync = self.time_sync
+        analyzer = self.clock_analyzer
+        offset = time_sync.clock_offset if time_sync else 0.0
 
-        if self.method == TimestampCorrectionMethod.OFFSET:
-            return offset
+        if self._method == TimestampCorrectionMethod.OFFSET or not analyzer:
+            return offset, 0.0
 
-        drift = 0.0
-        if self.clock_analyzer:
-            drift = self.clock_analyzer.drift_rate
-            # Record latest offset in analyzer for trend tracking.
-            self.clock_analyzer.record_offset(offset)
+        drift = analyzer.drift_rate
+        # Record latest offset in analyzer for trend tracking.
+        analyzer.record_offset(offset, now)
+        return offset, drift
 
-        if self.method == TimestampCorrectionMethod.DRIFT_COMPENSATED:
-            return offset + drift * 0.5  # speculative half-interval drift
+    def _offset_only(self, original_timestamp: float, offset: float, drift: float) -> float:
+        return offset
 
+    def _offset_drift_compensated(self, original_timestamp: float, offset: float, drift: float) -> float:
+        return offset + drift * 0.5  # speculative half-interval drift
+
+    def _offset_hybrid(self, original_timestamp: float, offset: float, drift: float) -> float:
         # Hybrid – mix current offset with drift prediction at timestamp horizon.
-        if self.time_sync:
-            predicted_offset = self.time_sync.get_predicted_offset(original_timestamp)
+        time_sync = self.time_sync
+        if time_sync:
+            predicted_offset = time_sync.get_predicted_offset(original_timestamp)
         else:
             predicted_offset = offset
 
         # Weight current measurement heavier (2/3 offset, 1/3 prediction)
         return (2 * offset + predicted_offset) / 3.0 + drift * 0.25
 
+    def _record_correction(self, original_timestamp: float, offset: float) -> Tuple[float, float]:
+        """Update statistics for one correction; returns (corrected, magnitude)."""
+        corrected_timestamp = original_timestamp + offset
+
+        # Update statistics in locals, then write back once; the correction
+        # magnitude is just |offset|
+        n = self.corrections_applied + 1
+        magnitude = abs(offset)
+        mean = self._magnitude_mean
+        delta = magnitude - mean
+        mean += delta / n
+        self.corrections_applied = n
+        self.total_correction_magnitude += magnitude
+        if magnitude > self.max_correction_magnitude:
+            self.max_correction_magnitude = magnitude
+        self._magnitude_mean = mean
+        self._magnitude_m2 += delta * (magnitude - mean)
+        self.correction_history.append((original_timestamp, corrected_timestamp))
+        return corrected_timestamp, magnitude
+
     def correct_timestamp(
         self,
         original_timestamp: float,
@@ -101,26 +178,78 @@ class TimestampCorrector:
     ) -> Tuple[float, Dict[str, float]]:
         """Return a drift-aware corrected timestamp and metadata."""
 
-        offset = self._compute_offset(original_timestamp)
-        corrected_timestamp = original_timestamp + offset
-
-        # Update statistics
-        self.corrections_applied += 1
-        magnitude = abs(corrected_timestamp - original_timestamp)
-        self.total_correction_magnitude += magnitude
-        self.max_correction_magnitude = max(self.max_correction_magnitude, magnitude)
-        self.correction_history.append((original_timestamp, corrected_timestamp))
+        # Read the clock once, before any other work, and share it with the
+        # analyzer so offset samples and their timestamps stay consistent
+        now = time.time()
+        offset = self._compute_offset(original_timestamp, now)
+        if abs(offset) < self.correction_tolerance:
+            # Close enough: leave the timestamp and statistics untouched
+            return original_timestamp, {
+                "applied_offset": 0.0,
+                "method": self._method.value,
+                "magnitude": 0.0,
+            }
+        corrected_timestamp, magnitude = self._record_correction(original_timestamp, offset)
 
         # Feed analyzer with peer-specific data if available.
-        if sender and self.clock_analyzer:
-            self.clock_analyzer.record_peer_offset(sender, offset)
+        analyzer = self.clock_analyzer
+        if sender and analyzer:
+            analyzer.record_peer_offset(sender, offset, now)
 
         return corrected_timestamp, {
             "applied_offset": offset,
-            "method": self.method.value,
+            "method": self._method.value,
             "magnitude": magnitude,
         }
 
+    def correct_batch(
+        self,
+        timestamps: Sequence[float],
+        sender: Optional[str] = None,
+    ) -> List[Tuple[float, Dict[str, float]]]:
+        """Correct many timestamps against a single clock sample.
+
+        The clock, offset and drift are sampled once for the whole batch, so
+        the results match ``correct_timestamp`` calls that all see that one
+        sample. Side effects differ from N scalar calls: the analyzer records
+        one offset (and at most one peer offset) per batch, so its history
+        and later drift estimates differ.
+        """
+        if not timestamps:
+            return []
+
+        now = time.time()
+        offset, drift = self._sample_clock(now)
+        strategy = self._offset_strategies[self._method]
+        method = self._method.value
+        record = self._record_correction
+        tolerance = self.correction_tolerance
+
+        results = []
+        last_applied = None
+        for original_timestamp in timestamps:
+            applied = strategy(original_timestamp, offset, drift)
+            if abs(applied) < tolerance:
+                results.append((original_timestamp, {
+                    "applied_offset": 0.0,
+                    "method": method,
+                    "magnitude": 0.0,
+                }))
+                continue
+            corrected_timestamp, magnitude = record(original_timestamp, applied)
+            results.append((corrected_timestamp, {
+                "applied_offset": applied,
+                "method": method,
+                "magnitude": magnitude,
+            }))
+            last_applied = applied
+
+        analyzer = self.clock_analyzer
+        if sender and analyzer and last_applied is not None:
+            analyzer.record_peer_offset(sender, last_applied, now)
+
+        return results
+
     def estimate_accuracy(
         self,
         corrected_timestamp: float,
@@ -129,31 +258,33 @@ class TimestampCorrector:
     ) -> Dict[str, float]:
         """Estimate accuracy bounds for a corrected timestamp."""
 
-        if not self.time_sync:
+        time_sync = self.time_sync
+        if not time_sync:
             return {
                 "confidence_interval": 0.5,
                 "lower_bound": corrected_timestamp - 0.25,
                 "upper_bound": corrected_timestamp + 0.25,
             }
 
-        accuracy = max(self.time_sync.sync_accuracy, 1e-6)
-        variance = accuracy**2
+        accuracy = max(time_sync.sync_accuracy, 1e-6)
         drift = self.clock_analyzer.drift_rate if self.clock_analyzer else 0.0
         age = abs(corrected_timestamp - original_timestamp)
 
         peer_offset = 0.0
-        if sender and getattr(self.time_sync, "peer_offsets", None):
-            peer_offset = abs(self.time_sync.peer_offsets.get(sender, 0.0))
+        if sender:
+            peer_offsets = getattr(time_sync, "peer_offsets", None)
+            if peer_offsets:
+                peer_offset = abs(peer_offsets.get(sender, 0.0))
 
-        # Confidence grows when more corrections exist.
+        # Confidence grows when more corrections exist; sqrt(accuracy**2 / n)
+        # is taken as accuracy / sqrt(n).
         sample_count = max(1, self.corrections_applied)
         confidence_interval = (
-            math.sqrt(variance / sample_count)
+            accuracy / math.sqrt(sample_count)
             + abs(drift) * 0.5
             + peer_offset * 0.1
             + age * 0.01
         )
-
         return {
             "confidence_interval": confidence_interval,
             "lower_bound": corrected_timestamp - confidence_interval,
@@ -167,24 +298,20 @@ class TimestampCorrector:
         self.corrections_applied = 0
         self.total_correction_magnitude = 0.0
         self.max_correction_magnitude = 0.0
+        self._magnitude_mean = 0.0
+        self._magnitude_m2 = 0.0
         self.correction_history.clear()
 
     def get_correction_statistics(self) -> Dict[str, float]:
-        if not self.correction_history:
-            return {
-                "corrections_applied": 0,
-                "average_correction_magnitude": 0.0,
-                "max_correction_magnitude": 0.0,
-                "current_method": self.method.value,
-            }
-
-        magnitudes = [abs(corrected - original) for original, corrected in self.correction_history]
-        average = statistics.fmean(magnitudes)
+        # O(1): running aggregates maintained in correct_timestamp; all zero
+        # before the first correction, so no separate empty case is needed
+        n = self.corrections_applied
+        variance = self._magnitude_m2 / (n - 1) if n > 1 else 0.0
 
         return {
-            "corrections_applied": self.corrections_applied,
-            "average_correction_magnitude": average,
+            "corrections_applied": n,
+            "average_correction_magnitude": self.total_correction_magnitude / max(1, n),
             "max_correction_magnitude": self.max_correction_magnitude,
-            "current_method": self.method.value,
+            "correction_magnitude_variance": variance,
+            "current_method": self._method.value,
         }
-
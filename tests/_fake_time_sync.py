@@ -0,0 +1,21 @@
+from collections.abc import Callable
+
+
+class FakeTimeSync:
+    """Minimal stand-in for TimeSync with a fixed offset and prediction."""
+
+    __slots__ = ("clock_offset", "sync_accuracy", "peer_offsets", "peer_last_sync", "get_predicted_offset")
+
+    clock_offset: float
+    sync_accuracy: float
+    peer_offsets: dict[str, float]
+    peer_last_sync: dict[str, float]
+    get_predicted_offset: Callable[[float], float]
+
+    def __init__(self, offset: float, predicted: float, accuracy: float = 0.01):
+        self.clock_offset = offset
+        self.sync_accuracy = accuracy
+        self.peer_offsets = {}
+        self.peer_last_sync = {}
+        # Instance attribute rather than a method: skips the descriptor lookup
+        self.get_predicted_offset = lambda _timestamp, _p=predicted: _p
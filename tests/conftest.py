@@ -1,7 +1,25 @@
 import sys
 from pathlib import Path
 
+import pytest  # type: ignore
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SRC_PATH = PROJECT_ROOT / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
+
+
+@pytest.fixture(scope="session")
+def now() -> float:
+    """Fixed wall-clock reading shared by tests that need a deterministic 'now'."""
+    return 1_700_000_000.0
+
+
+@pytest.fixture
+def analyzer():
+    """Fresh ClockSkewAnalyzer for each test, reset on teardown."""
+    from ds_messaging.time.clock_skew import ClockSkewAnalyzer
+
+    a = ClockSkewAnalyzer()
+    yield a
+    a.reset_analysis()
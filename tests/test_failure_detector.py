@@ -0,0 +1,21 @@
+import pytest  # type: ignore
+
+from ds_messaging.failure.detector import FailureDetector
+
+
+def test_peer_state_transitions() -> None:
+    detector = FailureDetector(["http://a", "http://b"], heartbeat_timeout=6.0)
+
+    detector.mark_alive("http://a", 100.0)
+    assert detector.get_alive_peers() == ["http://a"]
+    assert detector.peer_status["http://a"] == {"last_ok": 100.0, "alive": True}
+    with pytest.raises(TypeError):
+        detector.peer_status["http://a"]["alive"] = False
+
+    detector.mark_failed("http://a")
+    assert not detector.is_alive("http://a")
+
+    detector.mark_alive("http://a", 100.0)
+    assert detector.check_failures(103.0) == ["http://b"]
+    assert detector.check_failures(110.0) == ["http://a", "http://b"]
+    assert detector.get_alive_peers() == []
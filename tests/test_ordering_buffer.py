@@ -1,6 +1,11 @@
+import asyncio
 import time
 
-from ds_messaging.time.ordering import MessageOrderingBuffer, TimedMessage
+from ds_messaging.time.ordering import (
+    CausalOrderingManager,
+    MessageOrderingBuffer,
+    TimedMessage,
+)
 
 
 def _make_message(msg_id: str, corrected: float, received: float) -> TimedMessage:
@@ -41,3 +46,112 @@ def test_duplicate_messages_are_ignored() -> None:
     assert [m.msg_id for m in deliverable] == ["dup"]
     # Once delivered, the buffer should treat the message as duplicate
     assert not buffer.add_message(msg)
+
+
+def test_late_arrival_behind_delivered_message_counts_as_reordered() -> None:
+    buffer = MessageOrderingBuffer(buffer_timeout=0.1)
+    now = time.time()
+
+    assert buffer.add_message(_make_message("first", corrected=now + 2, received=now))
+    assert [m.msg_id for m in buffer.get_deliverable_messages(current_time=now + 1.0)] == ["first"]
+    assert buffer.messages_reordered == 0
+
+    assert buffer.add_message(_make_message("late", corrected=now + 1, received=now + 1))
+    assert buffer.messages_reordered == 1
+
+
+def test_peek_messages_does_not_deliver() -> None:
+    buffer = MessageOrderingBuffer()
+    now = time.time()
+
+    assert buffer.add_message(_make_message("late", corrected=now + 2, received=now))
+    assert buffer.add_message(_make_message("early", corrected=now + 1, received=now))
+
+    assert [m.msg_id for m in buffer.peek_messages(1)] == ["early"]
+    assert buffer.count_deliverable() == 2
+    assert buffer.messages_delivered == 0
+
+
+def test_full_buffer_drops_oldest_received_message() -> None:
+    buffer = MessageOrderingBuffer(max_buffer_size=3)
+    now = time.time()
+
+    for i in range(3):
+        assert buffer.add_message(_make_message(f"m{i}", corrected=now - i, received=now + i))
+    assert buffer.add_message(_make_message("m3", corrected=now + 5, received=now + 3))
+
+    assert buffer.messages_dropped == 1
+    assert buffer.count_deliverable() == 3
+    deliverable = buffer.get_deliverable_messages(current_time=now + 10)
+    assert [m.msg_id for m in deliverable] == ["m2", "m1", "m3"]
+
+
+def test_remove_message_skips_entry_without_rebuilding_heap() -> None:
+    buffer = MessageOrderingBuffer()
+    now = time.time()
+
+    for i in range(3):
+        assert buffer.add_message(_make_message(f"m{i}", corrected=now + i, received=now))
+
+    assert buffer.remove_message("m0")
+    assert not buffer.remove_message("m0")
+    assert not buffer.add_message(_make_message("m1", corrected=now, received=now))
+
+    deliverable = buffer.get_deliverable_messages(current_time=now + 10)
+    assert [m.msg_id for m in deliverable] == ["m1", "m2"]
+
+
+def test_vector_clock_delta_encoding_round_trip() -> None:
+    sender = CausalOrderingManager("a")
+    receiver = CausalOrderingManager("b")
+
+    sender.vector_clock.update({"a": 3, "c": 1})
+    first = sender.encode_clock_for("b")
+    assert first == {"anchor": 0, "delta": {"a": 3, "c": 1}}
+    assert receiver.decode_clock_from("a", first) == {"a": 3, "c": 1}
+
+    sender.increment_clock()
+    second = sender.encode_clock_for("b")
+    assert second["delta"] == {"a": 4}
+    assert receiver.decode_clock_from("a", second) == {"a": 4, "c": 1}
+
+    # A lost delta is detected by the anchor mismatch
+    sender.increment_clock()
+    sender.encode_clock_for("b")
+    sender.increment_clock()
+    assert receiver.decode_clock_from("a", sender.encode_clock_for("b")) is None
+
+
+def test_delivered_tracking_is_capped() -> None:
+    buffer = MessageOrderingBuffer(buffer_timeout=0.0, max_delivered_tracking=2)
+    now = time.time()
+
+    for i, msg_id in enumerate(["a", "b", "c"]):
+        assert buffer.add_message(_make_message(msg_id, corrected=now + i, received=now))
+        buffer.get_deliverable_messages(current_time=now + 1)
+
+    assert list(buffer.delivered_messages) == ["b", "c"]
+
+
+def test_deadline_wakeup_delivers_without_new_arrivals() -> None:
+    async def scenario() -> list:
+        buffer = MessageOrderingBuffer(buffer_timeout=0.05)
+        delivered: list = []
+        buffer.on_deliver = delivered.extend
+        now = time.time()
+        buffer.add_message(_make_message("a", corrected=now, received=now))
+        await asyncio.sleep(0.1)
+        return delivered
+
+    assert [m.msg_id for m in asyncio.run(scenario())] == ["a"]
+
+
+def test_equal_timestamps_deliver_in_arrival_order() -> None:
+    buffer = MessageOrderingBuffer(buffer_timeout=0.1)
+    now = time.time()
+
+    for msg_id in ["x", "y", "z"]:
+        assert buffer.add_message(_make_message(msg_id, corrected=now, received=now))
+
+    deliverable = buffer.get_deliverable_messages(current_time=now + 1.0)
+    assert [m.msg_id for m in deliverable] == ["x", "y", "z"]
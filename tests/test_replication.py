@@ -0,0 +1,54 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest  # type: ignore
+
+from ds_messaging.failure import replication
+from ds_messaging.failure.detector import FailureDetector
+
+
+def test_quorum_returns_before_slow_peer_and_finishes_it_in_background(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    asyncio.run(_run_quorum_check(monkeypatch, caplog))
+
+
+async def _run_quorum_check(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    detector = FailureDetector(["http://fast", "http://slow"])
+    detector.mark_alive("http://fast", 1.0)
+    detector.mark_alive("http://slow", 1.0)
+    node = SimpleNamespace(
+        failure_detector=detector,
+        replication_quorum=2,
+        replicate_urls={p: f"{p}/replicate" for p in detector.peers},
+    )
+
+    release_slow = asyncio.Event()
+    posted = []
+
+    async def fake_post(_sess, url, _data, timeout=None):
+        if url == "http://slow/replicate":
+            await release_slow.wait()
+            posted.append(url)
+            return RuntimeError("peer timed out")
+        posted.append(url)
+        return {"status": "ok"}
+
+    monkeypatch.setattr(replication, "_post_json", fake_post)
+
+    with caplog.at_level(logging.WARNING, logger=replication.__name__):
+        assert await replication.replicate_with_quorum(node, {"msg_id": "m1"}, None)
+        # Quorum came from the fast peer; the slow post is still running
+        assert posted == ["http://fast/replicate"]
+        assert len(replication._background_posts) == 1
+
+        release_slow.set()
+        await asyncio.gather(*replication._background_posts)
+        await asyncio.sleep(0)  # let the done callback run
+
+    assert posted == ["http://fast/replicate", "http://slow/replicate"]
+    assert not replication._background_posts
+    assert "Background replication to http://slow failed" in caplog.text
@@ -0,0 +1,113 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest  # type: ignore
+
+from ds_messaging.core.storage import Node
+
+
+def test_concurrent_writes_are_group_committed():
+    asyncio.run(_run_group_commit_check())
+
+
+async def _run_group_commit_check() -> None:
+    node = Node("127.0.0.1", 9101, "n1", [])
+    node.db_file = ":memory:"
+    await node.init_db()
+
+    def message(msg_id: str) -> dict:
+        return {"msg_id": msg_id, "sender": "client", "payload": msg_id, "ts": time.time()}
+
+    results = await asyncio.gather(
+        *(node.store_message(message(msg_id)) for msg_id in ["a", "b", "a", "c"])
+    )
+
+    assert [seq for seq, _, _ in results] == [1, 2, 1, 3]
+    assert [inserted for _, _, inserted in results] == [True, True, False, True]
+    assert results[1][1]["payload"] == "b"
+
+    # A later write of an existing id is reported as already present
+    seq, _, inserted = await node.store_message(message("b"))
+    assert (seq, inserted) == (2, False)
+    assert await node.get_max_seq() == 3
+
+    await node.db.close()
+
+
+def test_unbindable_message_fails_only_its_own_writer():
+    asyncio.run(_run_bad_row_check())
+
+
+async def _run_bad_row_check() -> None:
+    node = Node("127.0.0.1", 9102, "n1", [])
+    node.db_file = ":memory:"
+    await node.init_db()
+
+    messages = [
+        {"msg_id": "good1", "payload": "x"},
+        {"msg_id": "bad", "payload": {"nested": True}},
+        {"msg_id": "good2", "payload": "y"},
+    ]
+    results = await asyncio.gather(
+        *(node.store_message(msg) for msg in messages), return_exceptions=True
+    )
+
+    assert isinstance(results[1], sqlite3.ProgrammingError)
+    assert [results[0][2], results[2][2]] == [True, True]
+    assert await node.get_max_seq() == 2
+
+    await node.db.close()
+
+
+def test_failed_batch_is_rolled_back_and_retried_row_by_row():
+    asyncio.run(_run_batch_retry_check())
+
+
+async def _run_batch_retry_check() -> None:
+    node = Node("127.0.0.1", 9103, "n1", [])
+    node.db_file = ":memory:"
+    await node.init_db()
+
+    # Fail the first (batched) executemany after it has inserted some rows
+    executemany = node.db.executemany
+    calls = []
+
+    async def flaky_executemany(sql, rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            await executemany(sql, rows[:1])
+            raise sqlite3.OperationalError("disk I/O error")
+        return await executemany(sql, rows)
+
+    node.db.executemany = flaky_executemany
+
+    results = await asyncio.gather(
+        *(node.store_message({"msg_id": msg_id, "payload": msg_id}) for msg_id in ["a", "b"])
+    )
+
+    assert calls == [2, 1, 1]
+    assert [inserted for _, _, inserted in results] == [True, True]
+    assert await node.get_max_seq() == 2
+
+    await node.db.close()
+
+
+def test_cancelled_flush_cancels_waiting_writers():
+    asyncio.run(_run_cancelled_flush_check())
+
+
+async def _run_cancelled_flush_check() -> None:
+    node = Node("127.0.0.1", 9104, "n1", [])
+    node.db_file = ":memory:"
+    await node.init_db()
+
+    writer = asyncio.create_task(node.store_message({"msg_id": "a", "payload": "a"}))
+    await asyncio.sleep(0)
+    node._flush_task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await writer
+    assert node._write_queue == []
+
+    await node.db.close()
@@ -0,0 +1,65 @@
+import asyncio
+import itertools
+
+import pytest  # type: ignore
+
+from ds_messaging.time.api import _coalesced_sync, _inflight_syncs
+from ds_messaging.time.sync_protocol import TimeSync
+
+
+def test_superseded_sync_round_is_discarded(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Wall clock stepping backwards on every reading must not affect round ordering
+    readings = itertools.count(1_700_000_000.0, -10.0)
+    monkeypatch.setattr("ds_messaging.time.sync_protocol.time.time", lambda: next(readings))
+    asyncio.run(_run_overlapping_rounds())
+
+
+async def _run_overlapping_rounds() -> None:
+    time_sync = TimeSync(["http://peer"])
+    time_sync._get_session = lambda: None
+
+    # The first round's exchange is slow, the second's is immediate
+    exchanges = [(0.2, 1.0), (0.0, 2.0)]
+
+    async def fake_sync_with_peer(_peer, _session):
+        delay, offset = exchanges.pop(0)
+        await asyncio.sleep(delay)
+        return offset, 0.01
+
+    time_sync.sync_with_peer = fake_sync_with_peer
+
+    older = asyncio.create_task(time_sync.synchronize_with_peers())
+    await asyncio.sleep(0.05)
+    newer = asyncio.create_task(time_sync.synchronize_with_peers())
+
+    assert await newer is True
+    assert time_sync.clock_offset == 2.0
+
+    assert await older is False
+    assert time_sync.clock_offset == 2.0
+    assert time_sync.successful_syncs == 1
+
+
+def test_overlapping_manual_syncs_share_one_round() -> None:
+    asyncio.run(_run_coalesced_triggers())
+
+
+async def _run_coalesced_triggers() -> None:
+    calls = []
+    release = asyncio.Event()
+
+    class _CountingTimeSync:
+        async def synchronize_with_peers(self, node=None):
+            calls.append(node)
+            await release.wait()
+            return True
+
+    time_sync = _CountingTimeSync()
+    node = object()
+    triggers = [asyncio.create_task(_coalesced_sync(time_sync, node)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*triggers) == [True, True, True]
+    assert calls == [node]
+    assert time_sync not in _inflight_syncs
@@ -1,3 +1,4 @@
+import math
 import time
 
 import pytest  # type: ignore
@@ -5,51 +6,114 @@ import pytest  # type: ignore
 from ds_messaging.time.clock_skew import ClockSkewAnalyzer
 from ds_messaging.time.timestamp_correction import TimestampCorrectionMethod, TimestampCorrector
 
+from ._fake_time_sync import FakeTimeSync
 
-class _FakeTimeSync:
-    def __init__(self, offset: float, predicted: float, accuracy: float = 0.01):
-        self.clock_offset = offset
-        self._predicted = predicted
-        self.sync_accuracy = accuracy
-        self.peer_offsets = {}
-        self.peer_last_sync = {}
-
-    def get_predicted_offset(self, _timestamp: float) -> float:
-        return self._predicted
-
-
-@pytest.mark.parametrize(
-    "offset,predicted",
-    [
-        (0.05, 0.08),
-        (-0.12, -0.10),
-    ],
-)
-def test_correct_timestamp_hybrid(offset: float, predicted: float) -> None:
-    time_sync = _FakeTimeSync(offset, predicted)
-    analyzer = ClockSkewAnalyzer()
-    analyzer.drift_rate = 0.001
-    corrector = TimestampCorrector(time_sync, analyzer, method=TimestampCorrectionMethod.HYBRID)
 
-    original = time.time()
-    corrected, metadata = corrector.correct_timestamp(original)
+def test_correct_timestamp_hybrid(now: float, subtests: pytest.Subtests) -> None:
+    # Both (offset, predicted) cases in one test, through the batch path
+    for offset, predicted in [(0.05, 0.08), (-0.12, -0.10)]:
+        with subtests.test(msg=f"offset={offset}"):
+            # Fresh analyzer per case: correct_batch records offsets into it
+            analyzer = ClockSkewAnalyzer()
+            analyzer.drift_rate = 0.001
+            time_sync = FakeTimeSync(offset, predicted)
+            corrector = TimestampCorrector(time_sync, analyzer, method=TimestampCorrectionMethod.HYBRID)
 
-    expected_offset = metadata["applied_offset"]
-    assert abs((corrected - original) - expected_offset) < 1e-6
-    assert metadata["method"] == TimestampCorrectionMethod.HYBRID.value
-    assert metadata["magnitude"] >= 0.0
+            original = now
+            [(corrected, metadata)] = corrector.correct_batch([original])
 
-    accuracy = corrector.estimate_accuracy(corrected, original)
-    assert accuracy["upper_bound"] >= corrected
-    assert accuracy["lower_bound"] <= corrected
+            expected_offset = metadata["applied_offset"]
+            assert math.isclose(corrected - original, expected_offset, abs_tol=1e-6)
+            assert metadata["method"] == TimestampCorrectionMethod.HYBRID.value
+            assert metadata["magnitude"] >= 0.0
 
+            accuracy = corrector.estimate_accuracy(corrected, original)
+            assert accuracy["upper_bound"] >= corrected
+            assert accuracy["lower_bound"] <= corrected
 
-def test_validate_timestamp_rejects_future() -> None:
-    time_sync = _FakeTimeSync(0.0, 0.0)
-    analyzer = ClockSkewAnalyzer()
+
+def test_validate_timestamp_rejects_future(
+    now: float, analyzer: ClockSkewAnalyzer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("ds_messaging.time.timestamp_correction.time.time", lambda: now)
+    time_sync = FakeTimeSync(0.0, 0.0)
     corrector = TimestampCorrector(time_sync, analyzer)
 
-    far_future = time.time() + corrector.max_future_skew + 10
+    far_future = now + corrector.max_future_skew + 10
     ok, reason = corrector.validate_timestamp(far_future)
     assert not ok
-    assert "ahead" in reason
\ No newline at end of file
+    assert reason == "timestamp is implausibly ahead of local clock"
+
+
+def test_correction_statistics_track_running_mean_and_variance() -> None:
+    time_sync = FakeTimeSync(0.0, 0.0)
+    corrector = TimestampCorrector(time_sync, None, method=TimestampCorrectionMethod.OFFSET)
+
+    for offset in (0.1, 0.2, 0.3):
+        time_sync.clock_offset = offset
+        corrector.correct_timestamp(time.time())
+
+    stats = corrector.get_correction_statistics()
+    assert math.isclose(stats["average_correction_magnitude"], 0.2, abs_tol=1e-6)
+    assert math.isclose(stats["correction_magnitude_variance"], 0.01, abs_tol=1e-6)
+
+
+def test_correct_batch_matches_scalar_corrections() -> None:
+    analyzers = [ClockSkewAnalyzer(), ClockSkewAnalyzer()]
+    for analyzer in analyzers:
+        analyzer.drift_rate = 0.001
+    scalar = TimestampCorrector(FakeTimeSync(0.05, 0.08), analyzers[0])
+    batch = TimestampCorrector(FakeTimeSync(0.05, 0.08), analyzers[1])
+
+    now = time.time()
+    timestamps = [now - 1.0, now, now + 0.5]
+    expected = [scalar.correct_timestamp(ts) for ts in timestamps]
+
+    assert batch.correct_batch(timestamps) == expected
+    assert batch.get_correction_statistics() == scalar.get_correction_statistics()
+
+
+def test_validate_batch_flags_each_timestamp() -> None:
+    corrector = TimestampCorrector(FakeTimeSync(0.0, 0.0), ClockSkewAnalyzer())
+
+    now = time.time()
+    timestamps = [now, now + corrector.max_future_skew + 10, now - corrector.max_past_skew - 10, None, "bad"]
+    assert corrector.validate_batch(timestamps) == [True, False, False, False, False]
+
+
+def test_offsets_within_tolerance_are_not_applied() -> None:
+    corrector = TimestampCorrector(
+        FakeTimeSync(0.0004, 0.0004), None, method=TimestampCorrectionMethod.OFFSET
+    )
+
+    original = time.time()
+    corrected, metadata = corrector.correct_timestamp(original)
+
+    assert corrected == original
+    assert metadata["applied_offset"] == 0.0
+    assert corrector.get_correction_statistics()["corrections_applied"] == 0
+
+
+def test_method_accepts_plain_string(now: float) -> None:
+    corrector = TimestampCorrector(FakeTimeSync(0.05, 0.08), None, method="offset")
+
+    corrected, metadata = corrector.correct_timestamp(now)
+
+    assert corrector.method is TimestampCorrectionMethod.OFFSET
+    assert math.isclose(corrected - now, 0.05, abs_tol=1e-6)
+    assert metadata["method"] == "offset"
+
+
+def test_sync_interval_follows_assigned_drift_rate(analyzer: ClockSkewAnalyzer) -> None:
+    assert analyzer.recommend_sync_interval() == 300.0
+
+    analyzer.drift_rate = 0.001
+    assert analyzer.recommend_sync_interval() == 30.0
+
+
+def test_accuracy_without_time_sync_uses_fixed_bounds(now: float) -> None:
+    corrector = TimestampCorrector(None, None)
+
+    accuracy = corrector.estimate_accuracy(now, now)
+
+    assert accuracy == {"confidence_interval": 0.5, "lower_bound": now - 0.25, "upper_bound": now + 0.25}